@@ -0,0 +1,138 @@
+import hashlib
+from pathlib import Path
+from typing import Any, Iterable
+
+import orjson
+
+from butcher.data import _default, dump_json, load_json
+
+CACHE_DIR = ".cache"
+FINGERPRINT_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def resolve_cache_path(project_dir: Path, *parts: str) -> Path:
+    return project_dir.joinpath(CACHE_DIR, *parts)
+
+
+def fingerprint(*values: Any) -> str:
+    """
+    Stable hash of the given values,
+    strings and bytes are hashed as is, everything else is hashed as JSON with sorted keys
+    """
+    digest = hashlib.sha256()
+    for value in values:
+        if isinstance(value, str):
+            value = value.encode()
+        elif not isinstance(value, bytes):
+            value = orjson.dumps(value, option=FINGERPRINT_OPTIONS, default=_default)
+        digest.update(len(value).to_bytes(8, "little"))
+        digest.update(value)
+    return digest.hexdigest()
+
+
+def fingerprint_files(paths: Iterable[Path]) -> str:
+    values = []
+    for path in sorted(paths):
+        values.append(path.as_posix())
+        values.append(path.read_bytes())
+    return fingerprint(*values)
+
+
+class Manifest:
+    """
+    Persisted fingerprints of the generated files.
+
+    Fingerprint covers everything the file is rendered from, including its current contents,
+    so the entity can be skipped when the fingerprint is not changed since the last run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, str] = {}
+
+    @classmethod
+    def from_project(cls, project_dir: Path) -> "Manifest":
+        manifest = cls(path=resolve_cache_path(project_dir, "manifest.json"))
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        try:
+            self.entries = load_json(self.path)
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            self.entries = {}
+
+    def save(self) -> None:
+        dump_json(self.entries, self.path)
+
+    def check(self, key: str, value: str) -> bool:
+        return self.entries.get(key) == value
+
+    def update(self, key: str, value: str) -> None:
+        self.entries[key] = value
+
+
+class SchemaIndex:
+    """
+    Persisted index of the entities refreshed from the schema.
+
+    Each entity is stored with the hash of its schema content,
+    the size and modification time of its file when it was written and the deprecation mark,
+    so the unchanged entities are skipped without reading their files
+    and the deprecated ones are found without walking the entities tree.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.loaded = False
+
+    @classmethod
+    def from_project(cls, project_dir: Path) -> "SchemaIndex":
+        index = cls(path=resolve_cache_path(project_dir, "schema_index.json"))
+        index.load()
+        return index
+
+    def load(self) -> None:
+        try:
+            self.entries = load_json(self.path)
+            self.loaded = True
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            self.entries = {}
+            self.loaded = False
+
+    def save(self) -> None:
+        dump_json(self.entries, self.path)
+
+    @staticmethod
+    def _stat(path: Path) -> list[int] | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def check(
+        self, key: str, content_hash: str | None, path: Path, deprecated: bool = False
+    ) -> bool:
+        """
+        Entity is up to date when its content and deprecation mark are not changed
+        and its file is not changed since it was written
+        """
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry["hash"] == content_hash
+            and entry["deprecated"] == deprecated
+            and entry["stat"] == self._stat(path)
+        )
+
+    def update(self, key: str, content_hash: str | None, path: Path, deprecated: bool) -> None:
+        self.entries[key] = {
+            "hash": content_hash,
+            "stat": self._stat(path),
+            "deprecated": deprecated,
+        }
+
+    def remove(self, key: str) -> None:
+        self.entries.pop(key, None)
@@ -0,0 +1,86 @@
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import black
+
+from butcher.cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+def format_code(code: str, mode: black.FileMode) -> str:
+    """
+    Format the code by black, module-level function can be run by the worker processes
+    """
+    try:
+        return black.format_file_contents(code, fast=True, mode=mode)
+    except black.NothingChanged:
+        return code
+
+
+class FormatCache:
+    """
+    Content-addressed on-disk cache of the black output.
+
+    Entries are keyed by the unformatted source, black version and mode,
+    modification time of the entry is used as the last access time for LRU eviction.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, code: str, mode: black.FileMode) -> str:
+        return fingerprint(black.__version__, mode.get_cache_key(), code)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            code = path.read_text()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return code
+
+    def put(self, key: str, code: str) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Entries can be written concurrently by the worker processes, so write atomically
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(code)
+        os.replace(temp_path, path)
+
+    def trim(self) -> None:
+        if not self.directory.exists():
+            return
+        entries = []
+        total_size = 0
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total_size += stat.st_size
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+            removed += 1
+        logger.debug("Evicted %d entries from format cache %s", removed, self.directory)
@@ -0,0 +1,33 @@
+from textwrap import indent
+
+from butcher.codegen.generators.reference import render_entity_reference
+from butcher.codegen.generators.text import first_line
+from butcher.parsers.entities.model import Alias
+
+
+def alias_docstring(alias: Alias) -> str:
+    """
+    Docstring literal of the shortcut method indented as the method body
+    """
+    params_description = [
+        f":param {annotation.name}: {first_line(annotation.rst_description)}"
+        for annotation in alias.annotations
+    ]
+    ref = render_entity_reference("methods", alias.method)
+    params_description.append(f":return: instance of method {ref}")
+    fill_names = "\n- ".join(f":code:`{name}`" for name in alias.fill.keys())
+    description_lines = [
+        f"Shortcut for method {ref}\n"
+        f"will automatically fill method attributes:\n\n- {fill_names}",
+        alias.rst_description,
+        f"Source: https://core.telegram.org/bots/api#{alias.anchor}",
+        "\n".join(params_description),
+    ]
+    return '"""\n' + indent("\n\n".join(description_lines), prefix=" " * 8) + '\n        """'
+
+
+def alias_kwargs(alias: Alias) -> dict[str, str]:
+    return {
+        **alias.fill,
+        **{annotation.name: annotation.name for annotation in alias.annotations},
+    }
@@ -1,4 +1,6 @@
-from butcher.common_types import AnyDict
+from functools import lru_cache
+
+from butcher.parsers.entities.model import Annotation, ParsedType
 
 
 def args_as_str(*args, _trailing_coma: bool = False, **kwargs):
@@ -8,44 +10,53 @@ def args_as_str(*args, _trailing_coma: bool = False, **kwargs):
     return result
 
 
-def annotation_as_str(annotation: AnyDict, as_field: bool = False) -> str:
-    name = annotation["name"]
-    hint = type_as_str(annotation["parsed_type"])
+def annotation_parts(
+    annotation: Annotation, as_field: bool = False
+) -> tuple[str, str, str | None]:
+    """
+    Name, type hint and default value of the annotation as the source code
+    """
+    name = annotation.name
+    hint = type_as_str(annotation.parsed_type)
 
     field_kwargs = {}
 
-    value = annotation.get("value", None)
-    if not annotation["required"]:
+    value = annotation.value
+    if not annotation.required:
         hint = f"Optional[{hint}]"
         if not value:
             value = "None"
 
-    if const := annotation.get("const"):
+    if const := annotation.const:
         value = const
         field_kwargs["const"] = "True"
 
-    if alias := annotation.get("alias"):
+    if alias := annotation.alias:
         field_kwargs["alias"] = repr(alias)
 
-    result = f"{name}: {hint}"
+    if not value and not field_kwargs:
+        return name, hint, None
+    if as_field and field_kwargs:
+        value = f"Field({args_as_str(value or '...', **field_kwargs)})"
+    return name, hint, f"{value}"
 
-    if value or field_kwargs:
-        if as_field and field_kwargs:
-            value = f"Field({args_as_str(value or '...', **field_kwargs)})"
-        result += f" = {value}"
 
+def annotation_as_str(annotation: Annotation, as_field: bool = False) -> str:
+    name, hint, value = annotation_parts(annotation=annotation, as_field=as_field)
+    result = f"{name}: {hint}"
+    if value is not None:
+        result += f" = {value}"
     return result
 
 
-def type_as_str(value: AnyDict) -> str:
-    if value["type"] == "std":
-        return value["name"]
-    if value["type"] == "array":
-        return f"List[{type_as_str(value['items'])}]"
-    if value["type"] == "entity":
-        return value["references"]["name"]
-    if value["type"] == "union":
-        union_types = ", ".join(type_as_str(union_type) for union_type in value["items"])
+@lru_cache(maxsize=None)
+def type_as_str(value: ParsedType) -> str:
+    if value.type == "std" or value.type == "entity":
+        return value.name
+    if value.type == "array":
+        return f"List[{type_as_str(value.items[0])}]"
+    if value.type == "union":
+        union_types = ", ".join(type_as_str(union_type) for union_type in value.items)
         return f"Union[{union_types}]"
 
     raise NotImplementedError(f"Rendering of type {value} is not supported")
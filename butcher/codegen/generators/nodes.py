@@ -0,0 +1,87 @@
+from functools import lru_cache
+
+from libcst import (
+    AnnAssign,
+    Annotation,
+    Arg,
+    Assign,
+    AssignTarget,
+    BaseExpression,
+    BaseStatement,
+    Comma,
+    Expr,
+    Name,
+    Param,
+    SimpleStatementLine,
+    SimpleString,
+    parse_expression,
+    parse_statement,
+)
+
+from butcher.codegen.generators.annotation import annotation_parts
+from butcher.parsers.entities import model
+
+# Nodes are built directly instead of parsing the rendered source of each statement,
+# only the type hints and values are parsed and the parsed nodes are reused,
+# CST nodes are immutable, so they can be shared by the generated statements
+
+
+@lru_cache(maxsize=None)
+def expression(code: str) -> BaseExpression:
+    return parse_expression(code)
+
+
+@lru_cache(maxsize=None)
+def statement(code: str) -> BaseStatement:
+    return parse_statement(code)
+
+
+def string_statement(value: str) -> SimpleStatementLine:
+    """
+    Statement of the string literal, value is the literal with the quotes
+    """
+    return SimpleStatementLine(body=[Expr(value=SimpleString(value=value))])
+
+
+def docstring(text: str) -> SimpleStatementLine:
+    return string_statement(f'"""{text}"""')
+
+
+def assign_statement(name: str, value: BaseExpression) -> SimpleStatementLine:
+    return SimpleStatementLine(
+        body=[Assign(targets=[AssignTarget(target=Name(name))], value=value)]
+    )
+
+
+def annotation_statement(
+    annotation: model.Annotation, as_field: bool = False
+) -> SimpleStatementLine:
+    name, hint, value = annotation_parts(annotation=annotation, as_field=as_field)
+    return SimpleStatementLine(
+        body=[
+            AnnAssign(
+                target=Name(name),
+                annotation=Annotation(annotation=expression(hint)),
+                value=expression(value) if value is not None else None,
+            )
+        ]
+    )
+
+
+def annotation_param(annotation: model.Annotation) -> Param:
+    name, hint, value = annotation_parts(annotation=annotation)
+    return Param(
+        name=Name(name),
+        annotation=Annotation(annotation=expression(hint)),
+        default=expression(value) if value is not None else None,
+    )
+
+
+def keyword_args(values: dict[str, str], trailing_comma: bool = False) -> list[Arg]:
+    """
+    Keyword arguments passing the variables, the trailing comma is kept by black
+    """
+    args = [Arg(keyword=Name(name), value=Name(value)) for name, value in values.items()]
+    if trailing_comma and args:
+        args[-1] = args[-1].with_changes(comma=Comma())
+    return args
@@ -1,2 +1,14 @@
+from textwrap import indent
+
+
 def first_line(value: str) -> str:
     return value.split("\n", maxsplit=1)[0]
+
+
+def class_docstring(description: str, anchor: str | None = None) -> str:
+    """
+    Docstring literal of the entity class indented as the class body
+    """
+    if anchor:
+        description += f"\n\nSource: https://core.telegram.org/bots/api#{anchor}"
+    return indent(f'"""\n{description}\n"""', prefix="    ").lstrip()
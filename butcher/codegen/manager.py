@@ -1,45 +1,94 @@
+import ast
 from functools import lru_cache
 from pathlib import Path
-from typing import Sequence
+from typing import Collection, Sequence
 
 import black
-from libcst import parse_module
+from libcst import ClassDef, IndentedBlock, Module, Name, parse_module
 from libcst.codemod import CodemodContext
 from libcst.codemod.visitors import AddImportsVisitor
 
-from butcher.codegen.generators.bases import ensure_entity_class
-from butcher.codegen.generators.pythonize import pythonize_class_name, pythonize_name
+from butcher.cache import Manifest, fingerprint, fingerprint_files, resolve_cache_path
+from butcher.codegen.formatter import FormatCache, format_code
+from butcher.codegen.generators.pythonize import pythonize_name
+from butcher.codegen.templates import TEMPLATE_CATEGORIES, find_generated_class, render_class
 from butcher.codegen.transformers.bot import BotTransformer
 from butcher.codegen.transformers.enums import EnumEntityTransformer
 from butcher.codegen.transformers.init import InitTransformer
 from butcher.codegen.transformers.methods import MethodEntityTransformer
 from butcher.codegen.transformers.types import TypeEntityTransformer
-from butcher.common_types import AnyDict
 from butcher.parsers.entities.generator import EntitiesRegistry
+from butcher.parsers.entities.model import Entity
 from butcher.shell.config import ProjectConfig
 
 
 class CodegenManager:
-    def __init__(self, config: ProjectConfig, registry: EntitiesRegistry) -> None:
+    def __init__(
+        self,
+        config: ProjectConfig,
+        registry: EntitiesRegistry,
+        manifest: Manifest | None = None,
+    ) -> None:
         self.config = config
         self.registry = registry
+        self.manifest = manifest
+        self.format_cache = FormatCache(resolve_cache_path(config.project_dir, "black"))
 
     @lru_cache
-    def _get_black_mode(self):
+    def get_black_mode(self) -> black.FileMode:
         return black.FileMode(target_versions={black.TargetVersion.PY37}, line_length=99)
 
+    @lru_cache
+    def _get_generator_fingerprint(self) -> str:
+        return fingerprint(
+            black.__version__,
+            fingerprint_files(Path(__file__).parent.glob("**/*.py")),
+        )
+
+    def entity_fingerprint(self, category: str, name: str, code: str) -> str:
+        return fingerprint(
+            self._get_generator_fingerprint(),
+            self.registry.registry[category][name],
+            code,
+        )
+
+    def remember_entity(self, category: str, name: str, code: str) -> None:
+        if self.manifest is None:
+            return
+        self.manifest.update(
+            f"code:{category}/{name}", self.entity_fingerprint(category, name, code)
+        )
+        self.manifest.update(
+            f"formatted:{category}/{name}", fingerprint(self._get_generator_fingerprint(), code)
+        )
+
+    def is_formatted(self, category: str, name: str, code: str) -> bool:
+        """
+        Code is formatted when it is not changed since it was generated
+        """
+        return self.manifest is not None and self.manifest.check(
+            f"formatted:{category}/{name}", fingerprint(self._get_generator_fingerprint(), code)
+        )
+
+    def lookup_format(self, code: str) -> tuple[str, str | None]:
+        """
+        Key of the code in the format cache and the formatted code when it is cached
+        """
+        key = self.format_cache.key(code, mode=self.get_black_mode())
+        return key, self.format_cache.get(key)
+
     def _reformat_code(self, code: str) -> str:
+        key, cached = self.lookup_format(code)
+        if cached is not None:
+            return cached
+
         try:
-            return black.format_file_contents(
-                code,
-                fast=True,
-                mode=self._get_black_mode(),
-            )
-        except black.NothingChanged:
-            return code
+            new_code = format_code(code, mode=self.get_black_mode())
         except black.InvalidInput:
             print(code)
             raise
+        self.format_cache.put(key, new_code)
+        return new_code
 
     def resolve_package_path(self, *parts: str) -> Path:
         return self.config.package_dir.joinpath(*parts)
@@ -57,34 +106,89 @@ class CodegenManager:
         entity = self.registry.registry[category][name]
         return self._apply_entity(entity=entity, code=code)
 
-    def _apply_entity(self, entity: AnyDict, code: str) -> str:
-        module = parse_module(code)
-        module = ensure_entity_class(
-            module=module, name=pythonize_class_name(entity["object"]["name"])
+    def _apply_template(self, entity: Entity, code: str) -> tuple[str, bool] | None:
+        """
+        Render the class from the template when the module has no custom code in the class,
+        module is not formatted again when it was generated and the template is formatted
+        """
+        span = find_generated_class(code, entity)
+        if span is None:
+            return None
+        start, end, methods = span
+        template = render_class(entity, methods)
+        lines = code.splitlines(keepends=True)
+        new_code = "".join([*lines[:start], template.code, *lines[end:]])
+        return new_code, template.formatted and self.is_formatted(
+            entity.category, entity.name, code
         )
+
+    def _apply_entity(self, entity: Entity, code: str) -> str:
+        new_code, formatted = self._render_entity(entity=entity, code=code)
+        if formatted:
+            return new_code
+        return self._reformat_code(new_code)
+
+    def _render_entity(self, entity: Entity, code: str) -> tuple[str, bool]:
+        if entity.category in TEMPLATE_CATEGORIES:
+            result = self._apply_template(entity=entity, code=code)
+            if result is not None:
+                return result
+
+        module = parse_module(code)
         context = CodemodContext()
 
-        if entity["object"]["category"] == "types":
-            transformer = TypeEntityTransformer(entity=entity)
-        elif entity["object"]["category"] == "methods":
-            transformer = MethodEntityTransformer(entity=entity)
-        elif entity["object"]["category"] == "enums":
+        if entity.category == "types":
+            transformer = TypeEntityTransformer(context=context, entity=entity)
+        elif entity.category == "methods":
+            transformer = MethodEntityTransformer(context=context, entity=entity)
+        elif entity.category == "enums":
             transformer = EnumEntityTransformer(context=context, entity=entity)
         else:
             raise NotImplementedError()
 
+        # Class is ensured and the imports are added by the transformer in the same traversal
         module = module.visit(transformer)
-        module = module.visit(AddImportsVisitor(context=context))
 
-        new_code = module.code_for_node(module)
-        return self._reformat_code(new_code)
+        return module.code_for_node(module), False
+
+    def render_entity(self, category: str, name: str, code: str) -> tuple[str, bool]:
+        """
+        New code of the entity before formatting and whether it is formatted already,
+        so the caller can format it out of the current process.
+        Code is kept as is when it is not changed since it was generated
+        """
+        if self.manifest is not None and self.manifest.check(
+            f"code:{category}/{name}", self.entity_fingerprint(category, name, code)
+        ):
+            return code, True
+        entity = self.registry.registry[category][name]
+        return self._render_entity(entity=entity, code=code)
 
     def process_entity(self, category: str, name: str) -> tuple[Path, str, str]:
         code_path = self.entity_path(category, name=name)
         code = self.read_code(code_path)
-        new_code = self.apply_entity(category=category, name=name, code=code)
+        new_code, formatted = self.render_entity(category=category, name=name, code=code)
+        if not formatted:
+            new_code = self._reformat_code(new_code)
         return code_path, code, new_code
 
+    def init_fingerprint(self, names: Sequence[str], code: str) -> str:
+        return fingerprint(self._get_generator_fingerprint(), sorted(names), code)
+
+    def remember_init(self, category: str, names: Sequence[str], code: str) -> None:
+        if self.manifest is None:
+            return
+        self.manifest.update(f"code:{category}/__init__", self.init_fingerprint(names, code))
+
+    def process_init(self, category: str, names: Sequence[str]) -> tuple[Path, str, str]:
+        init_path = self.resolve_package_path(category, "__init__.py")
+        code = self.read_code(init_path)
+        if self.manifest is not None and self.manifest.check(
+            f"code:{category}/__init__", self.init_fingerprint(names, code)
+        ):
+            return init_path, code, code
+        return init_path, code, self.apply_init(code, names=names)
+
     def apply_init(self, code: str, names: Sequence[str]) -> str:
         module = parse_module(code)
         context = CodemodContext()
@@ -108,8 +212,88 @@ class CodegenManager:
         new_code = module.code_for_node(module)
         return self._reformat_code(new_code)
 
+    def _render_bot_method(self, transformer: BotTransformer, name: str) -> str:
+        node = transformer.render_method(name, transformer.methods[name])
+        # Method is formatted inside the class to get the same indentation as in the module
+        module = Module(body=[ClassDef(name=Name("Bot"), body=IndentedBlock(body=[node]))])
+        return self._reformat_code(module.code).split("\n", maxsplit=1)[1]
+
+    def apply_bot_methods(self, code: str, changed: Collection[str]) -> str | None:
+        """
+        Render only the changed methods of the formatted Bot class
+        and splice them into the code in place of the previous ones,
+        missing methods are added to the end of the class.
+
+        Methods are located by the line numbers of the syntax tree,
+        so the module is not parsed to CST and is not formatted again,
+        None is returned when there is no Bot class in the code
+        """
+        tree = ast.parse(code)
+        for bot_class in tree.body:
+            if isinstance(bot_class, ast.ClassDef) and bot_class.name == "Bot":
+                break
+        else:
+            return None
+
+        transformer = BotTransformer(
+            context=CodemodContext(), entities=self.registry.registry["methods"]
+        )
+        known_methods = {
+            node.name: node
+            for node in bot_class.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+        lines = code.splitlines(keepends=True)
+
+        missing_methods = transformer.method_names - known_methods.keys()
+        lines[bot_class.end_lineno : bot_class.end_lineno] = [
+            "\n" + self._render_bot_method(transformer, name) for name in sorted(missing_methods)
+        ]
+        # Methods are replaced from the end, so line numbers of the previous ones are kept
+        for node in sorted(
+            (known_methods[name] for name in changed if name in known_methods),
+            key=lambda node: node.lineno,
+            reverse=True,
+        ):
+            lines[node.lineno - 1 : node.end_lineno] = [
+                self._render_bot_method(transformer, node.name)
+            ]
+        return "".join(lines)
+
+    @lru_cache
+    def _get_bot_fingerprints(self) -> dict[str, str]:
+        generator_fingerprint = self._get_generator_fingerprint()
+        return {
+            name: fingerprint(generator_fingerprint, entity)
+            for name, entity in self.registry.registry["methods"].items()
+        }
+
+    def remember_bot(self, code: str) -> None:
+        if self.manifest is None:
+            return
+        self.manifest.update("code:bot", fingerprint(self._get_generator_fingerprint(), code))
+        for name, value in self._get_bot_fingerprints().items():
+            self.manifest.update(f"code:bot/{name}", value)
+
     def process_bot(self) -> tuple[Path, str, str]:
         code_path = self.resolve_package_path("client", "bot.py")
         code = self.read_code(code_path)
+
+        # Methods are rendered incrementally only while the module is not changed since it was
+        # generated, otherwise the whole module is rendered again
+        if self.manifest is not None and self.manifest.check(
+            "code:bot", fingerprint(self._get_generator_fingerprint(), code)
+        ):
+            changed = {
+                pythonize_name(name)
+                for name, value in self._get_bot_fingerprints().items()
+                if not self.manifest.check(f"code:bot/{name}", value)
+            }
+            if not changed:
+                return code_path, code, code
+            new_code = self.apply_bot_methods(code, changed=changed)
+            if new_code is not None:
+                return code_path, code, new_code
+
         new_code = self.apply_bot(code)
         return code_path, code, new_code
@@ -0,0 +1,184 @@
+import ast
+import io
+import tokenize
+from textwrap import indent
+
+from butcher.codegen.generators.alias import alias_docstring, alias_kwargs
+from butcher.codegen.generators.annotation import annotation_as_str, type_as_str
+from butcher.codegen.generators.pythonize import pythonize_class_name
+from butcher.codegen.generators.text import class_docstring, first_line
+from butcher.parsers.entities.model import Alias, Entity
+
+# Categories rendered from the templates when the class has nothing but the generated code,
+# enums are always merged since the values missing in the registry are kept in the class
+TEMPLATE_CATEGORIES = {"types", "methods"}
+LINE_LENGTH = 99
+
+BUILD_REQUEST_TEMPLATE = """
+def build_request(self, bot: Bot) -> Request:
+    data: Dict[str, Any] = self.dict()
+
+    return Request(method="{name}", data=data)
+"""
+
+
+class ClassTemplate:
+    """
+    Source of the entity class rendered in the same layout black gives
+    to the output of the entity transformers.
+
+    Template is marked as not formatted when black can change some of its lines,
+    in this case the rendered module has to be formatted anyway
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.formatted = True
+
+    @property
+    def code(self) -> str:
+        return "".join(f"{line}\n" for line in self.lines)
+
+    def add(self, *lines: str) -> None:
+        for line in lines:
+            if len(line) > LINE_LENGTH or "'" in line:
+                self.formatted = False
+            self.lines.append(line)
+
+    def add_string(self, literal: str) -> None:
+        # String statements are not changed by black, docstrings have to be checked
+        self.lines.extend(literal.split("\n"))
+
+    def add_docstring(self, literal: str) -> None:
+        lines = literal.split("\n")
+        if any(line != line.rstrip() or "\t" in line or line.endswith("\\") for line in lines):
+            self.formatted = False
+        self.lines.extend(lines)
+
+
+def _render_annotations(template: ClassTemplate, entity: Entity) -> None:
+    for annotation in entity.annotations:
+        template.add(f"    {annotation_as_str(annotation, as_field=True)}")
+        template.add_string(f'    """{first_line(annotation.rst_description)}"""')
+
+
+def _render_alias(template: ClassTemplate, name: str, alias: Alias) -> None:
+    method_class_name = pythonize_class_name(alias.method)
+    template.add(
+        "",
+        f"    def {name}(",
+        "        self,",
+        *(f"        {annotation_as_str(annotation)}," for annotation in alias.annotations),
+        "        **kwargs: Any,",
+        f"    ) -> {method_class_name}:",
+    )
+    template.add_docstring(f"        {alias_docstring(alias)}")
+    template.add(
+        "        # DO NOT EDIT MANUALLY!!!",
+        "        # This method was auto-generated via `butcher`",
+        "",
+        f"        from aiogram.methods import {method_class_name}",
+        "",
+        f"        return {method_class_name}(",
+        *(f"            {key}={value}," for key, value in alias_kwargs(alias).items()),
+        "            **kwargs,",
+        "        )",
+    )
+
+
+def _render_header(template: ClassTemplate, entity: Entity, bases: list[str]) -> None:
+    class_name = pythonize_class_name(entity.name)
+    template.add(f"class {class_name}({', '.join(bases)}):" if bases else f"class {class_name}:")
+    template.add_docstring(f"    {class_docstring(entity.rst_description, entity.anchor)}")
+
+
+def render_type_class(entity: Entity, methods: list[str]) -> ClassTemplate:
+    """
+    Type class with the shortcut methods in the order they are found in the class,
+    the missing ones are added after them
+    """
+    template = ClassTemplate()
+    _render_header(template, entity, entity.bases)
+    if entity.annotations:
+        template.add("")
+        _render_annotations(template, entity)
+
+    aliases = entity.aliases or {}
+    for name in [*methods, *(name for name in aliases if name not in methods)]:
+        _render_alias(template, name, aliases[name])
+    return template
+
+
+def build_request_source(entity: Entity) -> str:
+    return indent(BUILD_REQUEST_TEMPLATE.format(name=entity.name).lstrip(), prefix="    ")
+
+
+def render_method_class(entity: Entity) -> ClassTemplate:
+    returning_type = type_as_str(entity.returning.parsed_type)
+    template = ClassTemplate()
+    _render_header(template, entity, [f"{base}[{returning_type}]" for base in entity.bases])
+    template.add("", f"    __returning__ = {returning_type}")
+    if entity.annotations:
+        template.add("")
+        _render_annotations(template, entity)
+    template.add("")
+    template.lines.extend(build_request_source(entity).rstrip("\n").split("\n"))
+    return template
+
+
+def render_class(entity: Entity, methods: list[str]) -> ClassTemplate:
+    if entity.category == "types":
+        return render_type_class(entity, methods)
+    return render_method_class(entity)
+
+
+def _has_comments(source: str) -> bool:
+    tokens = tokenize.generate_tokens(io.StringIO(source).readline)
+    return any(token.type == tokenize.COMMENT for token in tokens)
+
+
+def find_generated_class(code: str, entity: Entity) -> tuple[int, int, list[str]] | None:
+    """
+    Lines span of the entity class and the names of its methods
+    when the class contains nothing but the generated code
+    (everything before the first method is generated, methods are the shortcuts of the type
+    or the generated build_request of the method, there are no comments out of the shortcuts),
+    None when the class has to be merged by the transformers
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    class_name = pythonize_class_name(entity.name)
+    classes = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ClassDef) and node.name == class_name
+    ]
+    if len(classes) != 1 or classes[0] not in tree.body:
+        return None
+    entity_class = classes[0]
+    if entity_class.decorator_list or entity_class.keywords:
+        return None
+
+    lines = code.splitlines(keepends=True)
+    methods = []
+    # Source of the class without the shortcuts, they are rendered again with their comments
+    checked_lines = lines[entity_class.lineno - 1 : entity_class.end_lineno]
+    for node in entity_class.body:
+        if not methods and not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if not isinstance(node, ast.FunctionDef) or node.decorator_list or node.name in methods:
+            return None
+        source = "".join(lines[node.lineno - 1 : node.end_lineno])
+        if entity.category == "types":
+            if node.name not in (entity.aliases or {}):
+                return None
+            for index in range(node.lineno, node.end_lineno + 1):
+                checked_lines[index - entity_class.lineno] = "\n"
+        elif node.name != "build_request" or source != build_request_source(entity):
+            return None
+        methods.append(node.name)
+    if _has_comments("".join(checked_lines)):
+        return None
+    return entity_class.lineno - 1, entity_class.end_lineno, methods
@@ -1,23 +1,48 @@
 from typing import Optional, Union
 
 from libcst import (
+    Annotation,
+    Asynchronous,
     BaseStatement,
+    Call,
     ClassDef,
+    Comma,
+    EmptyLine,
     FlattenSentinel,
     FunctionDef,
+    IndentedBlock,
+    Name,
+    Param,
+    Parameters,
     RemovalSentinel,
-    parse_statement,
 )
 from libcst.codemod import CodemodContext, ContextAwareTransformer
 
-from butcher.codegen.generators.annotation import annotation_as_str, args_as_str, type_as_str
+from butcher.codegen.generators.annotation import type_as_str
+from butcher.codegen.generators.nodes import (
+    annotation_param,
+    assign_statement,
+    expression,
+    keyword_args,
+    statement,
+    string_statement,
+)
 from butcher.codegen.generators.pythonize import pythonize_class_name, pythonize_name
 from butcher.codegen.generators.text import first_line
-from butcher.common_types import AnyDict
+from butcher.parsers.entities.model import Entity, ParsedType
+
+SELF_PARAM = Param(name=Name("self"))
+# Trailing comma of the last parameter is kept by black
+REQUEST_TIMEOUT_PARAM = Param(
+    name=Name("request_timeout"),
+    annotation=Annotation(annotation=expression("Optional[int]")),
+    default=Name("None"),
+    comma=Comma(),
+)
 
 
 class BotTransformer(ContextAwareTransformer):
-    def __init__(self, context: CodemodContext, entities: AnyDict) -> None:
+    def __init__(self, context: CodemodContext, entities: dict[str, Entity]) -> None:
         super().__init__(context=context)
 
         self.entities = entities
@@ -45,7 +70,7 @@ class BotTransformer(ContextAwareTransformer):
         body_extension = []
 
         for name in sorted(missing_methods):
-            body_extension.append(self._render_method(name, self.methods[name]))
+            body_extension.append(self.render_method(name, self.methods[name]))
 
         if not body_extension:
             return updated_node
@@ -69,76 +94,66 @@ class BotTransformer(ContextAwareTransformer):
         if not method:
             return original_node
 
-        return self._render_method(name, method)
+        return self.render_method(name, method)
 
-    def _ensure_import(self, item: AnyDict):
-        # if item["type"] == "entity":
-        #     references = item["references"]
+    def _ensure_import(self, item: ParsedType):
+        # if item.type == "entity":
         #     AddImportsVisitor.add_needed_import(
         #         self.context,
-        #         f"{references['category']}",
-        #         pythonize_class_name(references["name"]),
+        #         item.category,
+        #         pythonize_class_name(item.name),
         #         relative=2,
         #     )
-        # elif item["type"] == "union":
-        #     for variant in item["items"]:
+        # elif item.type in {"union", "array"}:
+        #     for variant in item.items:
         #         self._ensure_import(variant)
-        # elif item["type"] == "array":
-        #     self._ensure_import(item["items"])
         return
 
-    def _render_method(self, name, method: AnyDict):
-        args = []
+    def render_method(self, name, method: Entity):
+        params = []
         annotations = []
         call_kwargs = {}
 
-        self._ensure_import(
-            {
-                "type": "entity",
-                "references": {
-                    "category": "methods",
-                    "name": method["object"]["name"],
-                },
-            }
-        )
-        for annotation in method["object"]["annotations"]:
-            self._ensure_import(annotation["parsed_type"])
-            args.append(annotation_as_str(annotation))
+        self._ensure_import(ParsedType(type="entity", category="methods", name=method.name))
+        for annotation in method.annotations:
+            self._ensure_import(annotation.parsed_type)
+            params.append(annotation_param(annotation))
             annotations.append(
-                f":param {annotation['name']}: {first_line(annotation['rst_description'])}"
+                f":param {annotation.name}: {first_line(annotation.rst_description)}"
             )
-            call_kwargs[annotation["name"]] = annotation["name"]
+            call_kwargs[annotation.name] = annotation.name
         annotations.append(":param request_timeout: Request timeout")
-        return_description = first_line(
-            method["object"]["rst_description"].rsplit(". ", maxsplit=1)[-1]
-        )
+        return_description = first_line(method.rst_description.rsplit(". ", maxsplit=1)[-1])
         annotations.append(f":return: {return_description}")
 
-        self._ensure_import(method["object"]["returning"]["parsed_type"])
-        method_args = ", ".join(
-            [
-                "self",
-                *args,
-                "request_timeout: Optional[int] = None",
-            ]
-        )
+        self._ensure_import(method.returning.parsed_type)
         description = "\n".join(
             [
-                method["object"]["rst_description"].strip(),
+                method.rst_description.strip(),
                 "",
-                f"Source: https://core.telegram.org/bots/api#{method['object']}",
+                f"Source: https://core.telegram.org/bots/api#{method.anchor}",
                 "",
                 *annotations,
             ]
         )
 
-        statement = f'''
-async def {name}({method_args},) -> {type_as_str(method['object']['returning']['parsed_type'])}:
-    """
-{description}
-    """
-
-    call = {pythonize_class_name(method['object']['name'])}({args_as_str(**call_kwargs, _trailing_coma=True)})
-    return await self(call, request_timeout=request_timeout)
-        '''
-        return parse_statement(statement.strip())
+        call = assign_statement(
+            "call",
+            Call(
+                func=Name(pythonize_class_name(method.name)),
+                args=keyword_args(call_kwargs, trailing_comma=True),
+            ),
+        )
+        return FunctionDef(
+            name=Name(name),
+            params=Parameters(params=[SELF_PARAM, *params, REQUEST_TIMEOUT_PARAM]),
+            body=IndentedBlock(
+                body=[
+                    string_statement(f'"""\n{description}\n    """'),
+                    call.with_changes(leading_lines=[EmptyLine()]),
+                    statement("return await self(call, request_timeout=request_timeout)"),
+                ]
+            ),
+            returns=Annotation(annotation=expression(type_as_str(method.returning.parsed_type))),
+            asynchronous=Asynchronous(),
+        )
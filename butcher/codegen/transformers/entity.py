@@ -0,0 +1,94 @@
+from typing import Optional, Union
+
+from libcst import (
+    BaseStatement,
+    ClassDef,
+    FlattenSentinel,
+    FunctionDef,
+    ImportFrom,
+    ImportStar,
+    IndentedBlock,
+    Module,
+    Name,
+    RemovalSentinel,
+)
+from libcst.codemod import CodemodContext, ContextAwareTransformer
+from libcst.codemod.visitors import AddImportsVisitor
+from libcst.helpers import get_full_name_for_node
+
+from butcher.codegen.generators.pythonize import pythonize_class_name
+from butcher.parsers.entities.model import Entity
+
+
+class EntityTransformer(ContextAwareTransformer):
+    """
+    Base of the entity transformers.
+
+    The module is traversed once: the entity class is rewritten
+    or created at the end of the module when it is missing,
+    the imports found on the way are collected, so the imports visitor
+    is only run when the rendered class needs an import the module does not have yet
+    """
+
+    def __init__(self, context: CodemodContext, entity: Entity) -> None:
+        super().__init__(context=context)
+
+        self.entity = entity
+        self.class_name = pythonize_class_name(entity.name)
+        self.inside_class = False
+        self.found_class = False
+        self.found_methods = []
+        self.imported: set[tuple[str, str]] = set()
+        self.needed_imports: list[tuple[str, str]] = []
+
+    def add_needed_import(self, module: str, obj: str) -> None:
+        self.needed_imports.append((module, obj))
+
+    def visit_ImportFrom(self, node: "ImportFrom") -> Optional[bool]:
+        if node.relative or node.module is None or isinstance(node.names, ImportStar):
+            return False
+        module = get_full_name_for_node(node.module)
+        self.imported.update(
+            (module, alias.name.value) for alias in node.names if alias.asname is None
+        )
+        return False
+
+    def visit_ClassDef(self, node: "ClassDef") -> Optional[bool]:
+        if node.name.value == self.class_name:
+            self.inside_class = True
+            self.found_class = True
+            return True
+        return False
+
+    def visit_FunctionDef(self, node: "FunctionDef") -> Optional[bool]:
+        if not self.inside_class:
+            return False
+
+        self.found_methods.append(node.name.value)
+
+        return False
+
+    def leave_ClassDef(
+        self, original_node: "ClassDef", updated_node: "ClassDef"
+    ) -> Union["BaseStatement", FlattenSentinel["BaseStatement"], RemovalSentinel]:
+        if updated_node.name.value != self.class_name:
+            return updated_node
+        self.inside_class = False
+        return self.render_class(updated_node)
+
+    def render_class(self, class_node: ClassDef) -> ClassDef:
+        raise NotImplementedError
+
+    def leave_Module(self, original_node: "Module", updated_node: "Module") -> "Module":
+        if not self.found_class:
+            entity_class = ClassDef(name=Name(self.class_name), body=IndentedBlock(body=[]))
+            updated_node = updated_node.with_changes(
+                body=[*updated_node.body, self.render_class(entity_class)]
+            )
+
+        missing_imports = [item for item in self.needed_imports if item not in self.imported]
+        if not missing_imports:
+            return updated_node
+        for module, obj in missing_imports:
+            AddImportsVisitor.add_needed_import(self.context, module, obj)
+        return updated_node.visit(AddImportsVisitor(context=self.context))
@@ -1,4 +1,3 @@
-from textwrap import indent
 from typing import Optional, Union
 
 import libcst.matchers as m
@@ -6,64 +5,42 @@ from libcst import (
     Arg,
     Assign,
     BaseSmallStatement,
-    BaseStatement,
     ClassDef,
     FlattenSentinel,
-    FunctionDef,
     Name,
     Pass,
     RemovalSentinel,
     SimpleStatementLine,
-    parse_statement,
+    SimpleString,
 )
-from libcst.codemod import CodemodContext, ContextAwareTransformer
-from libcst.codemod.visitors import AddImportsVisitor
+from libcst.codemod import CodemodContext
 
-from butcher.codegen.generators.pythonize import pythonize_class_name
-from butcher.common_types import AnyDict
+from butcher.codegen.generators.nodes import assign_statement, expression, string_statement
+from butcher.codegen.generators.text import class_docstring
+from butcher.codegen.transformers.entity import EntityTransformer
+from butcher.parsers.entities.model import Entity
 
 
-class EnumEntityTransformer(ContextAwareTransformer):
-    def __init__(self, context: CodemodContext, entity: AnyDict) -> None:
-        super().__init__(context=context)
+class EnumEntityTransformer(EntityTransformer):
+    def __init__(self, context: CodemodContext, entity: Entity) -> None:
+        super().__init__(context=context, entity=entity)
 
-        self.entity = entity
-        self.inside_class = False
-        self.found_methods = []
         self.found_names = []
 
-    def visit_ClassDef(self, node: "ClassDef") -> Optional[bool]:
-        if node.name.value == pythonize_class_name(self.entity["object"]["name"]):
-            self.inside_class = True
-            return True
-        return False
-
     def _render_value(self, name: str, value: str) -> SimpleStatementLine:
-        if self.entity["object"]["type"] == "str":
-            value = f'"{value}"'
-        return parse_statement(f"{name} = {value}")
+        if self.entity.type == "str":
+            return assign_statement(name, SimpleString(f'"{value}"'))
+        return assign_statement(name, expression(f"{value}"))
 
     def _render_docstring(self):
-        description = self.entity["object"]["rst_description"]
-        return parse_statement(
-            indent(
-                f'"""\n{description}\n"""',
-                prefix="    ",
-            ).lstrip()
-        )
-
-    def leave_ClassDef(
-        self, original_node: "ClassDef", updated_node: "ClassDef"
-    ) -> Union["BaseStatement", FlattenSentinel["BaseStatement"], RemovalSentinel]:
-        if updated_node.name.value != pythonize_class_name(self.entity["object"]["name"]):
-            return updated_node
-        self.inside_class = False
+        return string_statement(class_docstring(self.entity.rst_description))
 
+    def render_class(self, class_node: ClassDef) -> ClassDef:
         node_index = 0
 
         body = []
 
-        for node_index, node in enumerate(updated_node.body.body):
+        for node_index, node in enumerate(class_node.body.body):
             if node_index == 0 and m.matches(
                 node, m.SimpleStatementLine(body=[m.Expr(value=m.SimpleString())])
             ):
@@ -77,7 +54,7 @@ class EnumEntityTransformer(ContextAwareTransformer):
                                 m.AssignTarget(
                                     target=m.Name(
                                         value=m.MatchIfTrue(
-                                            lambda value: value in self.entity["object"]["values"]
+                                            lambda value: value in self.entity.values
                                         )
                                     )
                                 )
@@ -93,31 +70,23 @@ class EnumEntityTransformer(ContextAwareTransformer):
         else:
             node_index += 1
 
-        bases = [Arg(value=Name(value=base)) for base in self.entity["object"]["bases"]]
+        bases = [Arg(value=Name(value=base)) for base in self.entity.bases]
 
-        AddImportsVisitor.add_needed_import(self.context, "enum", "Enum")
-        return updated_node.with_changes(bases=bases).with_deep_changes(
-            updated_node.body,
+        self.add_needed_import("enum", "Enum")
+        return class_node.with_changes(bases=bases).with_deep_changes(
+            class_node.body,
             body=[
                 self._render_docstring(),
                 *(
                     self._render_value(name, value)
-                    for name, value in self.entity["object"]["values"].items()
+                    for name, value in self.entity.values.items()
                     if name not in self.found_names
                 ),
                 *body,
-                *updated_node.body.body[node_index:],
+                *class_node.body.body[node_index:],
             ],
         )
 
-    def visit_FunctionDef(self, node: "FunctionDef") -> Optional[bool]:
-        if not self.inside_class:
-            return False
-
-        self.found_methods.append(node.name.value)
-
-        return False
-
     def visit_Pass(self, node: "Pass") -> Optional[bool]:
         return True
 
@@ -141,7 +110,7 @@ class EnumEntityTransformer(ContextAwareTransformer):
         if not name.isupper():
             return original_node
 
-        if (values := self.entity["object"]["values"]) and values.get(name, None):
+        if (values := self.entity.values) and values.get(name, None):
             return RemovalSentinel.REMOVE
 
         self.found_names.append(name)
@@ -1,5 +1,8 @@
-from typing import Any, TypeAlias
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+if TYPE_CHECKING:
+    from butcher.parsers.entities.model import Entity
 
 AnyDict: TypeAlias = dict[str, Any]
 CategoryType: TypeAlias = str
-RegistryType: TypeAlias = dict[CategoryType, dict[str, AnyDict]]
+RegistryType: TypeAlias = dict[CategoryType, dict[str, "Entity"]]
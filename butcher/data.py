@@ -5,13 +5,24 @@ from typing import Any
 import orjson
 import yaml
 
+from butcher.parsers.entities.model import Model
+
+# libyaml bindings are much faster than the pure-Python loader
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _default(value: Any) -> Any:
     if isinstance(value, datetime):
         return value.isoformat()
+    if isinstance(value, Model):
+        return value.to_dict()
     raise ValueError
 
 
+def dumps_json(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2, default=_default) + b"\n"
+
+
 def dump_json(value: Any, path: Path, force: bool = False) -> bool:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -21,7 +32,7 @@ def dump_json(value: Any, path: Path, force: bool = False) -> bool:
     else:
         current_content = b""
 
-    content = orjson.dumps(value, option=orjson.OPT_INDENT_2, default=_default) + b"\n"
+    content = dumps_json(value)
     if content != current_content or force:
         with path.open("wb") as f:
             f.write(content)
@@ -36,5 +47,4 @@ def load_json(path: Path) -> Any:
 
 def load_yaml(path: Path) -> Any:
     with path.open("r") as f:
-
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
@@ -1,19 +1,34 @@
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
 
+from butcher.cache import Manifest, fingerprint, fingerprint_files
 from butcher.codegen.generators.annotation import type_as_str
 from butcher.codegen.generators.pythonize import pythonize_class_name, pythonize_name
 from butcher.common_types import AnyDict
 from butcher.parsers.entities.generator import EntitiesRegistry
+from butcher.parsers.entities.model import Entity, ParsedType
 from butcher.shell.config import ProjectConfig
 
+PACKAGE_DIR = Path(__file__).parent.parent
+
+
+def render_type(value: AnyDict) -> str:
+    return type_as_str(ParsedType.from_dict(value))
+
 
 class DocsManager:
-    def __init__(self, config: ProjectConfig, registry: EntitiesRegistry) -> None:
+    def __init__(
+        self,
+        config: ProjectConfig,
+        registry: EntitiesRegistry,
+        manifest: Manifest | None = None,
+    ) -> None:
         self.config = config
         self.registry = registry
+        self.manifest = manifest
 
         self.env = Environment(
             loader=FileSystemLoader(
@@ -25,7 +40,7 @@ class DocsManager:
                 "header": lambda value, symbol: symbol * len(value),
                 "pythonize_name": pythonize_name,
                 "pythonize_class_name": pythonize_class_name,
-                "type": type_as_str,
+                "type": render_type,
             }
         )
 
@@ -41,32 +56,74 @@ class DocsManager:
         except FileNotFoundError:
             return ""
 
+    @lru_cache
+    def _get_generator_fingerprint(self) -> str:
+        return fingerprint(
+            # Docs are rendered with the helpers of the codegen and the model of the entities
+            fingerprint_files(
+                [
+                    Path(__file__),
+                    PACKAGE_DIR / "parsers" / "entities" / "model.py",
+                    *(PACKAGE_DIR / "codegen" / "generators").glob("**/*.py"),
+                ]
+            ),
+            fingerprint_files(
+                path
+                for path in (self.config.project_dir / "templates").glob("**/*")
+                if path.is_file()
+            ),
+        )
+
+    def entity_fingerprint(self, category: str, name: str, docs: str) -> str:
+        return fingerprint(
+            self._get_generator_fingerprint(),
+            self.registry.registry[category][name],
+            docs,
+        )
+
+    def remember_entity(self, category: str, name: str, docs: str) -> None:
+        if self.manifest is None:
+            return
+        self.manifest.update(
+            f"docs:{category}/{name}", self.entity_fingerprint(category, name, docs)
+        )
+
     def apply_entity(self, category: str, name: str, docs: str) -> str:
         entity = self.registry.registry[category][name]
         return self._apply_entity(entity=entity, docs=docs)
 
-    def _apply_entity(self, entity: AnyDict, docs: str) -> str:
-        if entity["object"]["category"] == "types":
+    def _apply_entity(self, entity: Entity, docs: str) -> str:
+        if entity.category == "types":
             template = self.env.get_template("types/entity.rst.jinja2")
-        elif entity["object"]["category"] == "methods":
+        elif entity.category == "methods":
             template = self.env.get_template("methods/entity.rst.jinja2")
-        elif entity["object"]["category"] == "enums":
+        elif entity.category == "enums":
             template = self.env.get_template("enums/entity.rst.jinja2")
         else:
             raise NotImplementedError()
 
-        return template.render(**entity).rstrip() + "\n"
+        # Templates are written against the JSON layout of the entity
+        return template.render(**entity.to_dict()).rstrip() + "\n"
+
+    def render_entity(self, category: str, name: str, docs: str) -> str:
+        """
+        New docs of the entity, docs are kept as is when they are not changed
+        since they were generated
+        """
+        if self.manifest is not None and self.manifest.check(
+            f"docs:{category}/{name}", self.entity_fingerprint(category, name, docs)
+        ):
+            return docs
+        return self.apply_entity(category=category, name=name, docs=docs)
 
     def process_entity(self, category: str, name: str) -> tuple[Path, str, str]:
         docs_path = self.entity_path("api", category, name=name)
         docs = self.read_code(docs_path)
-        new_docs = self.apply_entity(category=category, name=name, docs=docs)
-        return docs_path, docs, new_docs
+        return docs_path, docs, self.render_entity(category=category, name=name, docs=docs)
 
     def _collect_index(self, category: str):
         index = defaultdict(list)
-        for name, entity in self.registry.registry[category].items():
-            title = entity.get("group", {}).get("title", None)
+        for name, title in self.registry.collect_groups(category).items():
             index[title].append(name)
         for group in index.values():
             group.sort()
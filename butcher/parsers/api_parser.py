@@ -1,17 +1,74 @@
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Iterator
 
 import requests
 from lxml import etree, html
 from lxml.html import HtmlElement
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 
 from butcher.common_types import AnyDict
+from butcher.parsers.cache import CachedPage, PageCache
 from butcher.parsers.consts import ANCHOR_HEADER_PATTERN, READ_MORE_PATTERN, SYMBOLS_MAP
 from butcher.parsers.rst import node_to_rst
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class Section:
+    header: HtmlElement
+    container: HtmlElement
+    level: int
+    anchor: str
+    title: str
+    blocks: list[HtmlElement] = field(default_factory=list)
+
+
+def iter_sections(content: HtmlElement) -> Iterator[Section]:
+    """
+    Walk the page once: fix line breaks and split the content by anchored headers,
+    each section is emitted with the sibling blocks following its header
+    """
+    section = None
+
+    for event, element in etree.iterwalk(content, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == "br":
+                element.tail = "\n" + element.tail if element.tail else "\n"
+            continue
+        if not isinstance(tag, str):
+            continue
+
+        if matches := ANCHOR_HEADER_PATTERN.match(tag):
+            if section:
+                yield section
+                section = None
+
+            for item in element:  # type: HtmlElement
+                anchor_name = item.get("name", None)
+                if item.tag == "a" and item.get("class") == "anchor" and anchor_name:
+                    section = Section(
+                        header=element,
+                        container=element.getparent(),
+                        level=int(matches.group(1)),
+                        anchor=anchor_name,
+                        title=item.tail,
+                    )
+                    break
+        elif section and element.getparent() is section.container:
+            section.blocks.append(element)
+
+    if section:
+        yield section
+
+
 def parse_content(content: HtmlElement) -> AnyDict:
     groups = []
 
@@ -20,15 +77,10 @@ def parse_content(content: HtmlElement) -> AnyDict:
     version = None
     release_date = None
 
-    for item in content.xpath("//a[@class='anchor']"):  # type: HtmlElement
-        parent_tag: HtmlElement = item.getparent()
-        anchor_name = item.get("name", None)
-
-        matches = ANCHOR_HEADER_PATTERN.match(parent_tag.tag)
-        if not matches or not anchor_name:
-            continue
-        level = int(matches.group(1))
-        title = item.tail
+    for section in iter_sections(content):
+        level = section.level
+        anchor_name = section.anchor
+        title = section.title
 
         if level == 3:
             if group:
@@ -47,7 +99,7 @@ def parse_content(content: HtmlElement) -> AnyDict:
                 continue
 
             release_date = parse_release_date(str(title))
-            version = item.getparent().getnext().text_content().rsplit(" ", maxsplit=1)[-1]
+            version = section.header.getnext().text_content().rsplit(" ", maxsplit=1)[-1]
 
         if level == 4 and len(title.split()) > 1:
             continue
@@ -58,11 +110,12 @@ def parse_content(content: HtmlElement) -> AnyDict:
             "making-requests",
             "using-a-local-bot-api-server",
         ]:
-            child = _parse_child(parent_tag, anchor_name)
+            child = _parse_child(section.header, anchor_name, section.blocks)
             group["children"].append(child)
 
     if group:  # Optimize last group
         optimize_group(groups, group)
+    conversion_cache.log_stats()
 
     return {
         "api": {
@@ -97,24 +150,62 @@ def parse_release_date(value: str) -> date:
 
 
 def parse_docs(url: str) -> AnyDict:
-    raw_content = load_page(url=url)
+    raw_content, _ = load_page(url=url)
+    return parse_page(raw_content=raw_content, url=url)
+
+
+def parse_page(raw_content: str, url: str) -> AnyDict:
     content = to_html(content=raw_content, url=url)
     return parse_content(content=content)
 
 
-def load_page(url: str) -> str:
+@lru_cache
+def get_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=3)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Brotli is accepted only when the decoder is installed
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
+
+
+def load_page(url: str, cache: PageCache | None = None) -> tuple[str, bool]:
+    """
+    Load page, conditionally when the previous response is cached
+
+    :return: page content and whether it is modified since the cached response
+    """
     logger.debug("Load page %r", url)
-    response = requests.get(url)
+    headers = {}
+    cached = cache.load(url) if cache else None
+    if cached:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = get_session().get(url, headers=headers)
+    if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+        logger.debug("Page %r is not modified", url)
+        return cached.content, False
     response.raise_for_status()
-    return response.text
 
+    if cache:
+        cache.save(
+            url,
+            CachedPage(
+                content=response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            ),
+        )
+    return response.text, True
 
-def to_html(content: str, url: str) -> HtmlElement:
-    page = html.fromstring(content, url)
-    for br in page.xpath("*//br"):
-        br.tail = "\n" + br.tail if br.tail else "\n"
 
-    return page
+def to_html(content: str, url: str) -> HtmlElement:
+    # Line breaks are fixed up while walking the page in `iter_sections`
+    return html.fromstring(content, url)
 
 
 def optimize_group(groups: list[AnyDict], group: AnyDict):
@@ -129,7 +220,7 @@ def optimize_group(groups: list[AnyDict], group: AnyDict):
         group["children"].pop(0)
 
 
-def _parse_child(start_tag: HtmlElement, anchor: str):
+def _parse_child(start_tag: HtmlElement, anchor: str, blocks: list[HtmlElement]):
     name = str(start_tag.text_content())
     description = []
     html_description = []
@@ -140,7 +231,7 @@ def _parse_child(start_tag: HtmlElement, anchor: str):
 
     logger.debug("Parse block: %r (#%s)", name, anchor)
 
-    for item in _parse_tags_group(start_tag):
+    for item in blocks:
         if item.tag == "table":
             for raw in _parse_table(item):
                 if is_method:
@@ -151,16 +242,19 @@ def _parse_child(start_tag: HtmlElement, anchor: str):
 
         elif item.tag == "p":
             description.extend(item.text_content().splitlines())
-            html_description.append(node_to_html(item))
-            rst_description.append(node_to_rst(item))
+            html_value, rst_value = convert_node(item)
+            html_description.append(html_value)
+            rst_description.append(rst_value)
         elif item.tag == "blockquote":
             description.extend(_parse_blockquote(item))
-            html_description.append(node_to_html(item))
-            rst_description.append(node_to_rst(item))
+            html_value, rst_value = convert_node(item)
+            html_description.append(html_value)
+            rst_description.append(rst_value)
         elif item.tag == "ul":
             description.extend(_parse_list(item))
-            html_description.append(node_to_html(item))
-            rst_description.append(node_to_rst(item))
+            html_value, rst_value = convert_node(item)
+            html_description.append(html_value)
+            rst_description.append(rst_value)
 
     description = normalize_description("\n".join(description))
     html_description = "".join(html_description).strip()
@@ -178,13 +272,6 @@ def _parse_child(start_tag: HtmlElement, anchor: str):
     return block
 
 
-def _parse_tags_group(start_tag: HtmlElement):
-    tag: HtmlElement = start_tag.getnext()
-    while tag is not None and tag.tag not in ["h3", "h4"]:
-        yield tag
-        tag: HtmlElement = tag.getnext()
-
-
 def _parse_table(table: HtmlElement):
     head, body = table.getchildren()  # type: HtmlElement, HtmlElement
     header = [item.text_content() for item in head.getchildren()[0]]
@@ -192,9 +279,10 @@ def _parse_table(table: HtmlElement):
     for body_item in body:
         item_dict = dict(zip(header, body_item))
         item = {k.lower(): v.text_content() for k, v in item_dict.items()}
+        html_value, rst_value = convert_node(item_dict["Description"])
         item |= {
-            "html_description": node_to_html(item_dict["Description"]),
-            "rst_description": node_to_rst(item_dict["Description"]),
+            "html_description": html_value,
+            "rst_description": rst_value,
         }
         yield item
 
@@ -213,6 +301,54 @@ def node_to_html(item: HtmlElement) -> str:
     return etree.tostring(item).decode().strip()
 
 
+class ConversionCache:
+    """
+    Bounded LRU cache of the node conversions keyed by the serialized node,
+    so the repeated description fragments are converted once and shared in the schema
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[tuple[str, str], tuple[str, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def convert(self, node: HtmlElement) -> tuple[str, str]:
+        raw = etree.tostring(node).decode()
+        # Links are made absolute relative to the document
+        key = (node.base_url, raw)
+        if result := self.entries.get(key):
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self.entries[key] = (raw.strip(), node_to_rst(node))
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        logger.debug(
+            "Conversion cache: %d hits, %d misses (hit rate %.1f%%), %d entries",
+            self.hits,
+            self.misses,
+            self.hits / total * 100 if total else 0,
+            len(self.entries),
+        )
+
+
+conversion_cache = ConversionCache()
+
+
+def convert_node(item: HtmlElement) -> tuple[str, str]:
+    """
+    Convert node to HTML and RST
+    """
+    return conversion_cache.convert(item)
+
+
 def normalize_description(text: str) -> str:
     for bad, good in SYMBOLS_MAP.items():
         text = text.replace(bad, good)
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import orjson
+
+from butcher.cache import fingerprint
+from butcher.data import dump_json, load_json
+
+
+@dataclass
+class CachedPage:
+    content: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class PageCache:
+    """
+    On-disk cache of the loaded pages with validators for the conditional requests
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _resolve_paths(self, url: str) -> tuple[Path, Path]:
+        key = fingerprint(url)
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+
+    def load(self, url: str) -> CachedPage | None:
+        content_path, meta_path = self._resolve_paths(url)
+        try:
+            meta = load_json(meta_path)
+            content = content_path.read_text(encoding="utf-8")
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        return CachedPage(
+            content=content,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def save(self, url: str, page: CachedPage) -> None:
+        content_path, meta_path = self._resolve_paths(url)
+        content_path.parent.mkdir(parents=True, exist_ok=True)
+        content_path.write_text(page.content, encoding="utf-8")
+        dump_json(
+            {
+                "url": url,
+                "etag": page.etag,
+                "last_modified": page.last_modified,
+            },
+            meta_path,
+        )
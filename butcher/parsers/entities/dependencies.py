@@ -0,0 +1,27 @@
+from typing import Iterator, TypeAlias
+
+from butcher.common_types import AnyDict, CategoryType
+
+EntityKey: TypeAlias = tuple[CategoryType, str]
+# Entity, fields read and fields written
+Access: TypeAlias = tuple[EntityKey, frozenset[str], frozenset[str]]
+
+# Entity configs referring to the other entities
+DEPENDENCY_CONFIGS = {"extend", "aliases"}
+
+ANNOTATIONS = frozenset({"annotations"})
+
+
+def enum_related(enum_config: AnyDict) -> Iterator[Access]:
+    """
+    Entities used by the enum, values are parsed from their raw annotations
+    and annotations are updated with the enum values
+    """
+    if enum_parse := enum_config.get("parse"):
+        yield (enum_parse.get("category", "types"), enum_parse["entity"]), ANNOTATIONS, ANNOTATIONS
+    if enum_multi_parse := enum_config.get("multi_parse"):
+        category = enum_multi_parse.get("category", "types")
+        for entity_name in enum_multi_parse["entities"]:
+            yield (category, entity_name), ANNOTATIONS, ANNOTATIONS
+    if enum_extract := enum_config.get("extract"):
+        yield ("types", enum_extract["entity"]), ANNOTATIONS, frozenset()
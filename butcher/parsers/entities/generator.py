@@ -1,11 +1,17 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
 from pathlib import Path
+from typing import Sequence, TypeAlias
 
-from butcher.common_types import RegistryType
+from butcher.common_types import AnyDict, CategoryType, RegistryType
 from butcher.data import load_json, load_yaml
+from butcher.parsers.entities.dependencies import DEPENDENCY_CONFIGS, EntityKey, enum_related
+from butcher.parsers.entities.model import Entity
 from butcher.parsers.entities.resolvers.aliases import AliasesConfig
 from butcher.parsers.entities.resolvers.annotation_type import AnnotationTypeResolver
-from butcher.parsers.entities.resolvers.base import RejectResolver
+from butcher.parsers.entities.resolvers.base import EntityResolver, RejectResolver
 from butcher.parsers.entities.resolvers.base_class import BaseClassResolver
 from butcher.parsers.entities.resolvers.can_be_used_in_webhook import CanBeUsedInWebhookResolver
 from butcher.parsers.entities.resolvers.const import ConstResolver
@@ -13,22 +19,42 @@ from butcher.parsers.entities.resolvers.extend import ExtendResolver
 from butcher.parsers.entities.resolvers.replace import LocalReplacementResolver
 from butcher.parsers.entities.resolvers.reserved_names import ReservedNameResolver
 from butcher.parsers.entities.resolvers.returning_type import ReturningTypeResolver
+from butcher.parsers.entities.schedule import ResolveTask, link_tasks, run_tasks
+from butcher.parsers.entities.snapshot import (
+    RegistrySnapshot,
+    SnapshotState,
+    SourcesType,
+    dump_raw,
+    load_raw,
+)
 from butcher.parsers.enum import resolve_enum
 
 logger = logging.getLogger(__name__)
 
+SCAN_WORKERS = 16
+# Resolvers are pure Python and hold the GIL, so the graph runs sequentially by default
+RESOLVE_WORKERS = 1
+
+DependencyType: TypeAlias = tuple[EntityKey, EntityKey, bool]
+
 
 class EntitiesRegistry:
     def __init__(
         self,
         project_dir: Path,
+        resolve_workers: int = RESOLVE_WORKERS,
     ) -> None:
         self.project_dir = project_dir
+        # Independent resolver tasks are run concurrently with more than one worker
+        self.resolve_workers = resolve_workers
         self.registry: RegistryType = {
             "methods": {},
             "types": {},
             "enums": {},
         }
+        self.enum_configs: dict[str, AnyDict] = {}
+        # Registry is partial when only the requested entities are resolved
+        self.partial = False
 
         annotation_type_resolver = AnnotationTypeResolver()
         local_replacement_resolver = LocalReplacementResolver()
@@ -54,52 +80,337 @@ class EntitiesRegistry:
             ],
         }
 
-    def scan(self) -> None:
+    def collect_sources(self) -> SourcesType:
+        """
+        Input files of each entity and enum in the order they are resolved
+        """
+        sources: SourcesType = {}
         for category in [
             "methods",
             "types",
         ]:
-            category_mapping = self.registry.setdefault(category, {})
             category_dir = self.project_dir / category
             logger.debug("Scan category %r in %s", category, category_dir)
             for entity_path in category_dir.glob("**/entity.json"):
                 entity_dir = entity_path.parent
                 entity_name = entity_dir.name.removesuffix(entity_dir.suffix)
-                logger.debug("Load entity %r from %s", entity_name, entity_path)
-                entity = load_json(path=entity_path)
-                category_mapping[entity_name] = entity
-                entity_configs = entity["configs"] = {}
-
-                for config_path in entity_dir.glob("*.yml"):
-                    config_name = config_path.name.removesuffix(config_path.suffix)
-                    entity_configs[config_name] = load_yaml(config_path)
-
-    def resolve(self):
-        for category, entities in self.registry.items():
-            logger.debug("Resolve category %s", category)
-            for entity in entities.values():
-                logger.debug("Resolve entity %s.%s", category, entity["object"]["name"])
-                resolvers = self.resolvers.get(category)
-                if not resolvers:
-                    continue
+                sources[(category, entity_name)] = [entity_path, *entity_dir.glob("*.yml")]
 
-                for resolver in resolvers:
-                    try:
-                        resolver.resolve(registry=self.registry, entity=entity)
-                    except RejectResolver:
-                        continue
-
-    def resolve_enums(self):
-        logger.debug("Resolve enums")
         enums_dir = self.project_dir / "enums"
         for enum_config_path in enums_dir.glob("*.yml"):
-            enum_config = load_yaml(enum_config_path)
-            self.registry["enums"][enum_config["name"]] = resolve_enum(
-                registry=self.registry,
-                enum_config=enum_config,
+            sources[("enums", enum_config_path.name)] = [enum_config_path]
+        return sources
+
+    def scan(self, sources: SourcesType | None = None) -> None:
+        started_at = time.perf_counter()
+        if sources is None:
+            sources = self.sources
+
+        for (category, name), item in self._load_sources(sources).items():
+            if category == "enums":
+                self.enum_configs[name] = item
+            else:
+                self.registry[category][name] = item
+
+        logger.info("Scanned %d entities in %.3fs", len(sources), time.perf_counter() - started_at)
+
+    def _load_sources(self, sources: SourcesType) -> dict[EntityKey, AnyDict | Entity]:
+        # Loading is mostly waiting for the file system, so the files are read concurrently
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            return dict(zip(sources.keys(), executor.map(self._load_source, sources.items())))
+
+    def _load_source(self, source: tuple[EntityKey, list[Path]]) -> AnyDict | Entity:
+        (category, name), (path, *config_paths) = source
+        if category == "enums":
+            return load_yaml(path)
+
+        logger.debug("Load entity %r from %s", name, path)
+        entity = Entity.from_dict(load_json(path=path))
+        entity_configs = entity.configs = {}
+
+        for config_path in config_paths:
+            config_name = config_path.name.removesuffix(config_path.suffix)
+            entity_configs[config_name] = load_yaml(config_path)
+        return entity
+
+    def resolve(self, keys: set[EntityKey] | None = None, resolved: RegistryType = None):
+        """
+        Resolve enums and entities through the graph of the resolvers,
+        enums not listed in keys are taken from the already resolved registry
+        """
+        tasks = self._collect_tasks(keys=keys, resolved=resolved)
+        link_tasks(tasks)
+        run_tasks(tasks, workers=self.resolve_workers)
+
+    def _collect_tasks(
+        self, keys: set[EntityKey] | None, resolved: RegistryType | None
+    ) -> list[ResolveTask]:
+        """
+        Resolving tasks in the order they have to be run sequentially:
+        enums use the raw entities, then methods and types are resolved
+        """
+        tasks = []
+        enums = self.registry["enums"]
+        for config_name, enum_config in self.enum_configs.items():
+            enum_name = enum_config["name"]
+            if keys is not None and ("enums", config_name) not in keys:
+                enums[enum_name] = resolved["enums"][enum_name]
+                continue
+            # Placeholder keeps the order of the enums resolved out of order
+            enums[enum_name] = None
+            tasks.append(
+                ResolveTask(
+                    key=("enums", config_name),
+                    run=partial(self._resolve_enum, enum_config),
+                    accesses=list(enum_related(enum_config)),
+                )
             )
 
-    def initialize(self):
-        self.scan()
-        self.resolve_enums()
+        for category in ["methods", "types"]:
+            resolvers = self.resolvers.get(category, [])
+            for name, entity in self.registry[category].items():
+                key = category, name
+                if keys is not None and key not in keys:
+                    continue
+                for resolver in resolvers:
+                    tasks.append(
+                        ResolveTask(
+                            key=key,
+                            run=partial(self._run_resolver, resolver, entity),
+                            accesses=[
+                                (key, resolver.reads, resolver.writes),
+                                *resolver.related(entity),
+                            ],
+                        )
+                    )
+        return tasks
+
+    def _resolve_enum(self, enum_config: AnyDict) -> None:
+        logger.debug("Resolve enum %s", enum_config["name"])
+        self.registry["enums"][enum_config["name"]] = resolve_enum(
+            registry=self.registry,
+            enum_config=enum_config,
+        )
+
+    def _run_resolver(self, resolver: EntityResolver, entity: Entity) -> None:
+        try:
+            resolver.resolve(registry=self.registry, entity=entity)
+        except RejectResolver:
+            pass
+
+    @cached_property
+    def sources(self) -> SourcesType:
+        return self.collect_sources()
+
+    @cached_property
+    def known_enums(self) -> dict[str, str]:
+        """
+        Config names of the enums by the enum names
+        """
+        return {
+            load_yaml(paths[0])["name"]: name
+            for (category, name), paths in self.sources.items()
+            if category == "enums"
+        }
+
+    def is_known(self, category: CategoryType, name: str) -> bool:
+        if category == "enums":
+            return name in self.known_enums
+        return (category, name) in self.sources
+
+    def collect_groups(self, category: CategoryType) -> dict[str, str | None]:
+        """
+        Group titles of all entities in the category, even when the registry is partial
+        """
+        if not self.partial:
+            groups = {name: entity.group for name, entity in self.registry[category].items()}
+        elif category == "enums":
+            # Enums are not grouped
+            groups = {name: None for name in self.known_enums}
+        else:
+            groups = {
+                name: (
+                    entity.group
+                    if (entity := self.registry[category].get(name))
+                    else load_json(paths[0]).get("group")
+                )
+                for (entity_category, name), paths in self.sources.items()
+                if entity_category == category
+            }
+        return {name: (group or {}).get("title", None) for name, group in groups.items()}
+
+    def initialize(self, category: CategoryType | None = None, names: Sequence[str] = ()):
+        """
+        Load and resolve the registry,
+        when names are given only they and the entities they depend on are resolved
+        """
+        started_at = time.perf_counter()
+        snapshot = RegistrySnapshot.from_project(self.project_dir)
+        state = snapshot.load()
+        sources = self.sources
+        changed, inputs = snapshot.check_inputs(state=state, sources=sources)
+
+        if state and not changed:
+            self.registry = state.registry
+            logger.info("Loaded registry snapshot in %.3fs", time.perf_counter() - started_at)
+            return
+
+        if names:
+            if category == "enums":
+                keys = {("enums", self.known_enums[name]) for name in names}
+            else:
+                keys = {(category, name) for name in names}
+            self._initialize_partial(keys=keys)
+            logger.info(
+                "Initialized %d of %d entities in %.3fs",
+                sum(map(len, self.registry.values())),
+                len(sources),
+                time.perf_counter() - started_at,
+            )
+            return
+
+        if state:
+            raw = self._reinitialize(state=state, changed=changed)
+        else:
+            self.scan(sources=sources)
+            raw = dump_raw({**self.registry, "enums": self.enum_configs})
+            self.resolve()
+
+        snapshot.save(SnapshotState(inputs=inputs, raw=raw, registry=self.registry))
+        logger.info("Initialized registry in %.3fs", time.perf_counter() - started_at)
+
+    def _initialize_partial(self, keys: set[EntityKey]) -> None:
+        """
+        Load and resolve only the given entities and everything their resolving depends on
+        """
+        self.partial = True
+
+        # Only configs linking entities are needed to find the dependencies
+        stubs = {"methods": {}, "types": {}, "enums": {}}
+        for (category, name), paths in self.sources.items():
+            if category == "enums":
+                stubs[category][name] = load_yaml(paths[0])
+                continue
+            stubs[category][name] = Entity(
+                configs={
+                    path.stem: load_yaml(path)
+                    for path in paths[1:]
+                    if path.stem in DEPENDENCY_CONFIGS
+                }
+            )
+        required = self._collect_required(
+            keys=keys, dependencies=self._collect_dependencies(raws=[stubs])
+        )
+
+        sources = {key: paths for key, paths in self.sources.items() if key in required}
+        self.scan(sources=sources)
         self.resolve()
+
+    def _reinitialize(self, state: SnapshotState, changed: set[EntityKey]) -> bytes:
+        """
+        Re-resolve only the entities affected by the changed inputs,
+        everything else is taken from the snapshot
+
+        :return: raw entities for the next snapshot
+        """
+        sources = self.sources
+        previous_raw = load_raw(state.raw)
+        loaded = self._load_sources({key: sources[key] for key in sources if key in changed})
+        raw = {"methods": {}, "types": {}, "enums": {}}
+        for category, name in sources:
+            if (category, name) in changed:
+                raw[category][name] = loaded[(category, name)]
+            else:
+                raw[category][name] = previous_raw[category][name]
+        result = dump_raw(raw)
+
+        affected = self._collect_affected(
+            changed=changed,
+            dependencies=self._collect_dependencies(raws=[previous_raw, raw]),
+        )
+        logger.info(
+            "Changed %d entities, re-resolving %d affected entities", len(changed), len(affected)
+        )
+
+        self.enum_configs = raw.pop("enums")
+        for category, entities in raw.items():
+            registry_entities = self.registry[category]
+            for name, entity in entities.items():
+                if (category, name) in affected:
+                    # Affected entities are resolved again from their raw state
+                    registry_entities[name] = entity
+                else:
+                    registry_entities[name] = state.registry[category][name]
+
+        self.resolve(keys=affected, resolved=state.registry)
+        return result
+
+    def _collect_dependencies(self, raws: list[AnyDict]) -> set[DependencyType]:
+        """
+        Dependencies between the entities as (dependent, dependency, reset) triples
+        collected from the fields of the other entities the resolvers access.
+
+        Reset means the dependency should be in its raw state when the dependent is resolved:
+        it is modified by the dependent, or it is used before it is resolved
+        (enums use raw entities, types can clone types resolved after them).
+        """
+        order = {
+            key: index
+            for index, key in enumerate(
+                sorted(self.sources, key=lambda item: item[0] != "enums"),
+            )
+        }
+        dependencies = set()
+        for raw in raws:
+            related = []
+            for category in ["methods", "types"]:
+                for name, entity in raw[category].items():
+                    for resolver in self.resolvers[category]:
+                        related.extend(
+                            ((category, name), access) for access in resolver.related(entity)
+                        )
+            for config_name, enum_config in raw["enums"].items():
+                related.extend(
+                    (("enums", config_name), access) for access in enum_related(enum_config)
+                )
+
+            for dependent, (dependency, _, writes) in related:
+                reset = bool(writes) or order.get(dependency, -1) > order.get(dependent, -1)
+                dependencies.add((dependent, dependency, reset))
+        return dependencies
+
+    def _collect_affected(
+        self, changed: set[EntityKey], dependencies: set[DependencyType]
+    ) -> set[EntityKey]:
+        """
+        Entities that are resolved differently when the changed entities are resolved again:
+        entities using the affected ones and entities reset by the affected ones
+        """
+        affected = set(changed)
+        size = 0
+        while size != len(affected):
+            size = len(affected)
+            for dependent, dependency, reset in dependencies:
+                if dependency in affected:
+                    affected.add(dependent)
+                if reset and dependent in affected:
+                    affected.add(dependency)
+        return affected
+
+    def _collect_required(
+        self, keys: set[EntityKey], dependencies: set[DependencyType]
+    ) -> set[EntityKey]:
+        """
+        Entities required to resolve the given ones the same way as the whole registry:
+        entities used by the required ones and entities resetting the required ones
+        """
+        required = set(keys)
+        size = 0
+        while size != len(required):
+            size = len(required)
+            for dependent, dependency, reset in dependencies:
+                if dependent in required:
+                    required.add(dependency)
+                if reset and dependency in required:
+                    required.add(dependent)
+        return required
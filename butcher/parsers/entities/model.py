@@ -0,0 +1,339 @@
+import sys
+from typing import Any
+
+from butcher.common_types import AnyDict
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class Model:
+    """
+    Base of the compact entity models.
+
+    Fields are listed in the order of the JSON layout, unset fields are None
+    and are not dumped back to the JSON layout
+    """
+
+    __slots__ = ()
+    fields: tuple[str, ...] = ()
+
+    def __init__(self, **values: Any) -> None:
+        for name in self.fields:
+            object.__setattr__(self, name, values.pop(name, None))
+        if values:
+            raise TypeError(f"Unknown fields of {type(self).__name__}: {', '.join(values)}")
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.fields
+            if getattr(self, name) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def _dump_fields(self) -> AnyDict:
+        result = {}
+        for name in self.fields:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            result[name] = value
+        return result
+
+    def to_dict(self) -> AnyDict:
+        return self._dump_fields()
+
+
+class ParsedType(Model):
+    """
+    Parsed type of the annotation:
+    std type by name (optionally with the literal value), entity reference by category and name,
+    array of one item type or union of the item types.
+
+    Parsed types are immutable and compared by value,
+    interned types are shared by all the annotations using the same type
+    """
+
+    fields = ("type", "name", "category", "value", "items")
+    __slots__ = (*fields, "_hash")
+
+    def __init__(self, **values: Any) -> None:
+        super().__init__(**values)
+        object.__setattr__(self, "_hash", hash(self._values()))
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.fields)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, ParsedType):
+            return NotImplemented
+        return self._hash == other._hash and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple:
+        # Hash of the strings differs between the processes, so it is not pickled
+        return _restore_parsed_type, self._values()
+
+    @classmethod
+    def intern(cls, parsed_type: "ParsedType") -> "ParsedType":
+        return _PARSED_TYPES.setdefault(parsed_type, parsed_type)
+
+    @classmethod
+    def from_dict(cls, data: AnyDict) -> "ParsedType":
+        type_ = data["type"]
+        if type_ == "array":
+            parsed_type = cls(type=type_, items=(cls.from_dict(data["items"]),))
+        elif type_ == "union":
+            parsed_type = cls(
+                type=type_, items=tuple(cls.from_dict(item) for item in data["items"])
+            )
+        elif type_ == "entity":
+            references = data["references"]
+            parsed_type = cls(
+                type=type_,
+                category=_intern(references["category"]),
+                name=_intern(references["name"]),
+            )
+        else:
+            parsed_type = cls(
+                type=_intern(type_), name=_intern(data.get("name")), value=data.get("value")
+            )
+        return cls.intern(parsed_type)
+
+    def to_dict(self) -> AnyDict:
+        if self.type == "array":
+            return {"type": self.type, "items": self.items[0].to_dict()}
+        if self.type == "union":
+            return {"type": self.type, "items": [item.to_dict() for item in self.items]}
+        if self.type == "entity":
+            return {
+                "type": self.type,
+                "references": {"category": self.category, "name": self.name},
+            }
+        result = {"type": self.type, "name": self.name}
+        if self.value is not None:
+            result["value"] = self.value
+        return result
+
+
+_PARSED_TYPES: dict[ParsedType, ParsedType] = {}
+
+
+def _restore_parsed_type(*values: Any) -> ParsedType:
+    return ParsedType.intern(ParsedType(**dict(zip(ParsedType.fields, values))))
+
+
+class Annotation(Model):
+    """
+    Field of the type or argument of the method,
+    keys unknown to the model are kept in extra (it is not allocated when there are none)
+    """
+
+    fields = (
+        "type",
+        "description",
+        "html_description",
+        "rst_description",
+        "name",
+        "required",
+        "alias",
+        "enum_value",
+        "parsed_type",
+        "const",
+        "value",
+    )
+    __slots__ = (*fields, "extra")
+
+    def __init__(self, **values: Any) -> None:
+        self.extra = None
+        super().__init__(**values)
+
+    @classmethod
+    def from_dict(cls, data: AnyDict) -> "Annotation":
+        annotation = cls()
+        annotation.update(data)
+        return annotation
+
+    def update(self, data: AnyDict) -> None:
+        for name, value in data.items():
+            if name == "parsed_type" and value is not None:
+                value = ParsedType.from_dict(value)
+            if name in self.fields:
+                setattr(self, name, _intern(value))
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[name] = value
+
+    def copy(self) -> "Annotation":
+        annotation = Annotation()
+        for name in self.fields:
+            setattr(annotation, name, getattr(self, name))
+        annotation.extra = self.extra and self.extra.copy()
+        return annotation
+
+    def to_dict(self) -> AnyDict:
+        return {**self._dump_fields(), **(self.extra or {})}
+
+
+class Returning(Model):
+    """
+    Result type of the method
+    """
+
+    fields = ("type", "parsed_type", "description")
+    __slots__ = fields
+
+    @classmethod
+    def from_dict(cls, data: AnyDict) -> "Returning":
+        return cls(
+            type=_intern(data.get("type")),
+            parsed_type=ParsedType.from_dict(data["parsed_type"]),
+            description=data.get("description"),
+        )
+
+
+class Alias(Model):
+    """
+    Shortcut of the type for the method with some arguments filled from the type
+    """
+
+    fields = (
+        "method",
+        "anchor",
+        "fill",
+        "description",
+        "html_description",
+        "rst_description",
+        "annotations",
+        "returning",
+    )
+    __slots__ = fields
+
+    @classmethod
+    def from_dict(cls, data: AnyDict) -> "Alias":
+        return cls(
+            **{
+                **data,
+                "annotations": [Annotation.from_dict(item) for item in data["annotations"]],
+                "returning": Returning.from_dict(data["returning"]),
+            }
+        )
+
+
+class Entity(Model):
+    """
+    Type, method or enum.
+
+    Fields of the "object" of the JSON layout are stored flat next to the entity fields,
+    object keys unknown to the model are kept in extra.
+
+    Annotations are looked up by name through the index built on the first lookup,
+    so annotations have to be added and renamed through the entity
+    """
+
+    object_fields = (
+        "anchor",
+        "name",
+        "type",
+        "bases",
+        "description",
+        "html_description",
+        "rst_description",
+        "docs",
+        "values",
+        "annotations",
+        "category",
+        "returning",
+    )
+    fields = (
+        "meta",
+        "group",
+        *object_fields,
+        "configs",
+        "can_be_used_in_webhook",
+        "aliased",
+        "aliases",
+    )
+    __slots__ = (*fields, "extra", "_annotations_index")
+
+    def __init__(self, **values: Any) -> None:
+        self.extra = None
+        self._annotations_index = None
+        super().__init__(**values)
+
+    def find_annotation(self, name: str) -> Annotation | None:
+        if self._annotations_index is None:
+            index = self._annotations_index = {}
+            for annotation in self.annotations:
+                index.setdefault(annotation.name, annotation)
+        return self._annotations_index.get(name)
+
+    def add_annotation(self, annotation: Annotation) -> None:
+        self.annotations.append(annotation)
+        if self._annotations_index is not None:
+            self._annotations_index.setdefault(annotation.name, annotation)
+
+    def rename_annotation(self, annotation: Annotation, name: str) -> None:
+        annotation.name = name
+        # Index is rebuilt on the next lookup
+        self._annotations_index = None
+
+    @classmethod
+    def from_dict(cls, data: AnyDict) -> "Entity":
+        entity = cls()
+        for name, value in data.items():
+            if name != "object":
+                setattr(entity, name, value)
+        for name, value in data.get("object", {}).items():
+            if name == "annotations":
+                value = [Annotation.from_dict(item) for item in value]
+            elif name == "returning":
+                value = Returning.from_dict(value)
+            if name in cls.object_fields:
+                setattr(entity, name, _intern(value))
+            else:
+                if entity.extra is None:
+                    entity.extra = {}
+                entity.extra[name] = value
+        if entity.aliases is not None:
+            entity.aliases = {
+                name: Alias.from_dict(alias) for name, alias in entity.aliases.items()
+            }
+        return entity
+
+    def to_dict(self) -> AnyDict:
+        values = self._dump_fields()
+        result = {name: values[name] for name in ("meta", "group") if name in values}
+        result["object"] = {
+            **{name: values[name] for name in self.object_fields if name in values},
+            **(self.extra or {}),
+        }
+        for name in ("configs", "can_be_used_in_webhook", "aliased", "aliases"):
+            if name in values:
+                result[name] = values[name]
+        if self.aliases is not None:
+            result["aliases"] = {name: alias.to_dict() for name, alias in self.aliases.items()}
+        return result
@@ -1,38 +1,62 @@
+from typing import Iterator
+
 from butcher.common_types import AnyDict, RegistryType
+from butcher.parsers.entities.dependencies import Access
+from butcher.parsers.entities.model import Alias, Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
+METHOD_READS = frozenset(
+    {
+        "anchor",
+        "description",
+        "html_description",
+        "rst_description",
+        "annotations",
+        "returning",
+    }
+)
+# Aliased method is marked with the alias
+METHOD_WRITES = frozenset({"aliased"})
+
 
 class AliasesConfig(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
+    reads = frozenset({"name"})
+    writes = frozenset({"aliases"})
+
+    def related(self, entity: Entity) -> Iterator[Access]:
+        aliases_config = self.optional_ensure_config(entity, "aliases") or {}
+        for alias in aliases_config.values():
+            yield ("methods", alias["method"]), METHOD_READS, METHOD_WRITES
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
         aliases_config = self.ensure_config(entity, "aliases")
 
-        aliases = entity["aliases"] = {}
+        aliases = entity.aliases = {}
         for name, alias in aliases_config.items():
             aliases[name] = self._resolve_alias(
                 registry=registry, entity=entity, name=name, alias=alias
             )
 
-    def _resolve_alias(self, registry: RegistryType, entity: AnyDict, name: str, alias: AnyDict):
+    def _resolve_alias(
+        self, registry: RegistryType, entity: Entity, name: str, alias: AnyDict
+    ) -> Alias:
         referenced_method = registry["methods"][alias["method"]]
         fill = alias["fill"]
-        result = {
-            "method": alias["method"],
-            "anchor": referenced_method["object"]["anchor"],
-            "fill": alias["fill"],
-            "description": referenced_method["object"]["description"],
-            "html_description": referenced_method["object"]["html_description"],
-            "rst_description": referenced_method["object"]["rst_description"],
-            "annotations": [
-                item
-                for item in referenced_method["object"]["annotations"]
-                if item["name"] not in fill
-            ],
-            "returning": referenced_method["object"]["returning"],
-        }
-        method_aliased = referenced_method.setdefault("aliased", [])
-        method_aliased.append(
+        result = Alias(
+            method=alias["method"],
+            anchor=referenced_method.anchor,
+            fill=alias["fill"],
+            description=referenced_method.description,
+            html_description=referenced_method.html_description,
+            rst_description=referenced_method.rst_description,
+            annotations=[item for item in referenced_method.annotations if item.name not in fill],
+            returning=referenced_method.returning,
+        )
+        if referenced_method.aliased is None:
+            referenced_method.aliased = []
+        referenced_method.aliased.append(
             {
-                "type": entity["object"]["name"],
+                "type": entity.name,
                 "name": name,
             }
         )
@@ -1,5 +1,8 @@
-from butcher.common_types import AnyDict, RegistryType
+from functools import lru_cache
+
+from butcher.common_types import RegistryType
 from butcher.parsers.entities.entity_type import ENTITY_CATEGORY, detect_entity_type_by_name
+from butcher.parsers.entities.model import Entity, ParsedType
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 BUILTIN_TYPES = {
@@ -11,49 +14,59 @@ BUILTIN_TYPES = {
 
 
 class AnnotationTypeResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        for annotation in entity["object"]["annotations"]:
-            annotation["parsed_type"] = parse_type(annotation["type"])
-        entity["object"]["annotations"].sort(key=lambda item: not item["required"])
+    reads = frozenset({"annotations"})
+    writes = frozenset({"annotations"})
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        for annotation in entity.annotations:
+            annotation.parsed_type = parse_type(annotation.type)
+        entity.annotations.sort(key=lambda item: not item.required)
+
+
+@lru_cache(maxsize=None)
+def parse_type(value: str) -> ParsedType:
+    """
+    Parse the type from the documentation,
+    results are shared between the calls and must not be modified
+    """
+    return ParsedType.intern(_parse_type(value))
 
 
-def parse_type(value: str) -> AnyDict:
+def _parse_type(value: str) -> ParsedType:
     if not value:
-        return {"type": "std", "name": "Any"}
+        return ParsedType(type="std", name="Any")
 
     lower = value.lower()
     split = lower.split()
 
     if split[0] == "array":
         new_string = value[lower.index("of") + 2 :].strip()
-        return {"type": "array", "items": parse_type(new_string)}
+        return ParsedType(type="array", items=(parse_type(new_string),))
     if "messages" in split:
         return parse_type(value.replace("Messages", "array of Message"))
     if "or" in split:
         split_types = value.split(" or ")
-        return {
-            "type": "union",
-            "items": [parse_type(item.strip()) for item in split_types],
-        }
+        return ParsedType(
+            type="union",
+            items=tuple(parse_type(item.strip()) for item in split_types),
+        )
     if "and" in split:
         split_types = value.split(" and ")
-        return {
-            "type": "union",
-            "items": [parse_type(item.strip()) for item in split_types],
-        }
+        return ParsedType(
+            type="union",
+            items=tuple(parse_type(item.strip()) for item in split_types),
+        )
     if "number" in lower:
         return parse_type(value.replace("number", "").strip())
     if lower in ["true", "false"]:
-        return {"type": "std", "name": "bool", "value": lower == "true"}
+        return ParsedType(type="std", name="bool", value=lower == "true")
     if value not in BUILTIN_TYPES and value[0].isupper():
-        return {
-            "type": "entity",
-            "references": {
-                "category": ENTITY_CATEGORY[detect_entity_type_by_name(value)],
-                "name": str(value),
-            },
-        }
+        return ParsedType(
+            type="entity",
+            category=ENTITY_CATEGORY[detect_entity_type_by_name(value)],
+            name=str(value),
+        )
     elif value in BUILTIN_TYPES:
-        return {"type": "std", "name": BUILTIN_TYPES[value]}
+        return ParsedType(type="std", name=BUILTIN_TYPES[value])
 
     raise ValueError(f"Type {value} can't be parsed")
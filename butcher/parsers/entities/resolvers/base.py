@@ -1,15 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 from butcher.common_types import AnyDict, RegistryType
+from butcher.parsers.entities.dependencies import Access
+from butcher.parsers.entities.model import Entity
 
 
 class EntityResolver(ABC):
+    # Fields of the resolved entity read and written by the resolver,
+    # resolvers are scheduled by them, so they have to be complete
+    reads: frozenset[str] = frozenset()
+    writes: frozenset[str] = frozenset()
+
     @abstractmethod
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
         pass
 
-    def ensure_config(self, entity: AnyDict, name: str) -> AnyDict:
-        configs = entity.get("configs")
+    def related(self, entity: Entity) -> Iterator[Access]:
+        """
+        Fields of the other entities accessed while resolving the entity
+        """
+        return iter(())
+
+    def ensure_config(self, entity: Entity, name: str) -> AnyDict:
+        configs = entity.configs
         if not configs:
             raise RejectResolver("entity has no configs")
         config = configs.get(name)
@@ -17,9 +31,9 @@ class EntityResolver(ABC):
             raise RejectResolver(f"entity has no config named {name!r}")
         return config
 
-    def optional_ensure_config(self, entity: AnyDict, name: str) -> AnyDict | None:
+    def optional_ensure_config(self, entity: Entity, name: str) -> AnyDict | None:
         try:
-            self.ensure_config(entity=entity, name=name)
+            return self.ensure_config(entity=entity, name=name)
         except RejectResolver:
             return None
 
@@ -1,10 +1,13 @@
-from butcher.common_types import AnyDict, RegistryType
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.model import Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 
 class BaseClassResolver(EntityResolver):
+    writes = frozenset({"bases"})
+
     def __init__(self, *bases: str):
         self.bases = bases
 
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        entity["object"]["bases"] = list(self.bases)
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        entity.bases = list(self.bases)
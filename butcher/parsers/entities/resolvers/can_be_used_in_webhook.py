@@ -1,19 +1,23 @@
-from butcher.common_types import AnyDict, RegistryType
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.model import Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 
 class CanBeUsedInWebhookResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        entity["can_be_used_in_webhook"] = self._detect(entity["object"])
+    reads = frozenset({"name", "annotations"})
+    writes = frozenset({"can_be_used_in_webhook"})
 
-    def _detect(self, obj: AnyDict) -> bool:
-        if obj["name"].startswith("get"):
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        entity.can_be_used_in_webhook = self._detect(entity)
+
+    def _detect(self, entity: Entity) -> bool:
+        if entity.name.startswith("get"):
             return False
-        for annotation in obj["annotations"]:
+        for annotation in entity.annotations:
             if (
-                annotation["parsed_type"]["type"] == "entity"
-                and annotation["parsed_type"]["references"]["name"] == "InputFile"
-                and annotation["required"] is True
+                annotation.parsed_type.type == "entity"
+                and annotation.parsed_type.name == "InputFile"
+                and annotation.required is True
             ):
                 return False
         return True
@@ -1,6 +1,7 @@
 import re
 
-from butcher.common_types import AnyDict, RegistryType
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.model import Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 CONST_PATTERNS = [
@@ -10,14 +11,17 @@ CONST_PATTERNS = [
 
 
 class ConstResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        for annotation in entity["object"]["annotations"]:
-            description = annotation["description"]
+    reads = frozenset({"annotations"})
+    writes = frozenset({"annotations"})
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        for annotation in entity.annotations:
+            description = annotation.description
             is_const = False
             for pattern in CONST_PATTERNS:
                 if result := pattern.search(description):
-                    annotation["const"] = f'"{result.group(1)}"'
+                    annotation.const = f'"{result.group(1)}"'
                     is_const = True
                     break
-            if is_const and (enum_value := annotation.get("enum_value")):
-                annotation["const"] = enum_value
+            if is_const and (enum_value := annotation.enum_value):
+                annotation.const = enum_value
@@ -1,40 +1,50 @@
-from butcher.common_types import AnyDict, RegistryType
+from typing import Iterator
+
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.dependencies import ANNOTATIONS, Access
+from butcher.parsers.entities.model import Annotation, Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 
 class ExtendResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
+    reads = ANNOTATIONS
+    writes = ANNOTATIONS
+
+    def related(self, entity: Entity) -> Iterator[Access]:
+        config = self.optional_ensure_config(entity, "extend") or {}
+        for item in config.get("clone", []):
+            if isinstance(item, dict):
+                item = list(item.keys())[0]
+            yield ("types", item), ANNOTATIONS, frozenset()
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
         config = self.ensure_config(entity, "extend")
 
         define = config.get("define", [])
         clone = config.get("clone", [])
 
-        annotations = entity["object"]["annotations"]
-        names = {annotation["name"] for annotation in annotations}
         for item in define:
-            if item["name"] in names:
+            if entity.find_annotation(item["name"]):
                 continue
-            annotations.append(item)
-            names.add(item["name"])
+            entity.add_annotation(Annotation.from_dict(item))
 
         for item in clone:
             entity_name = item
             if isinstance(item, dict):
                 entity_name = list(item.keys())[0]
                 entity_config = item[entity_name]
-                exclude_names = entity_config.get("exclude", [])
+                exclude_names = set(entity_config.get("exclude", []))
             else:
                 entity_name = item
                 entity_config = {}
-                exclude_names = []
+                exclude_names = set()
 
-            entity = registry["types"][entity_name]
-            for annotation in entity["object"]["annotations"]:
-                if annotation["name"] in names or annotation["name"] in exclude_names:
+            source = registry["types"][entity_name]
+            for annotation in source.annotations:
+                if annotation.name in exclude_names or entity.find_annotation(annotation.name):
                     continue
                 cloned = annotation.copy()
-                cloned["required"] = False
-                if not cloned["rst_description"].startswith("*Optional*"):
-                    cloned["rst_description"] = f"*Optional*. {cloned['rst_description']}"
-                annotations.append(cloned)
-                names.add(annotation["name"])
+                cloned.required = False
+                if not cloned.rst_description.startswith("*Optional*"):
+                    cloned.rst_description = f"*Optional*. {cloned.rst_description}"
+                entity.add_annotation(cloned)
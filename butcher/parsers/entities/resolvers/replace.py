@@ -1,23 +1,28 @@
 from butcher.common_types import AnyDict, RegistryType
+from butcher.parsers.entities.model import Entity, Returning
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 
 class LocalReplacementResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
+    reads = frozenset({"annotations"})
+    writes = frozenset({"annotations", "bases", "returning"})
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
         replace_config = self.ensure_config(entity, "replace")
         self._resolve_replacement(entity=entity, config=replace_config)
 
-    def _resolve_replacement(self, entity: AnyDict, config: AnyDict):
+    def _resolve_replacement(self, entity: Entity, config: AnyDict):
         if annotations := config.get("annotations"):
             self._resolve_annotations(entity=entity, annotations=annotations)
         if bases := config.get("bases"):
-            entity["object"]["bases"] = bases
+            entity.bases = bases
         if returning := config.get("returning"):
-            entity["object"]["returning"] = returning
+            entity.returning = Returning.from_dict(returning)
 
-    def _resolve_annotations(self, entity: AnyDict, annotations: AnyDict):
-        for annotation in entity["object"]["annotations"]:
-            replacement = annotations.get(annotation["name"])
-            if not replacement:
+    def _resolve_annotations(self, entity: Entity, annotations: AnyDict):
+        for name, replacement in annotations.items():
+            if not replacement or not (annotation := entity.find_annotation(name)):
                 continue
             annotation.update(replacement)
+            if annotation.name != name:
+                entity.rename_annotation(annotation, annotation.name)
@@ -1,4 +1,5 @@
-from butcher.common_types import AnyDict, RegistryType
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.model import Entity
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 RESERVED = {
@@ -7,11 +8,14 @@ RESERVED = {
 
 
 class ReservedNameResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        for annotation in entity["object"]["annotations"]:
-            replacement = RESERVED.get(annotation["name"])
+    reads = frozenset({"annotations"})
+    writes = frozenset({"annotations"})
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        for annotation in entity.annotations:
+            replacement = RESERVED.get(annotation.name)
             if not replacement:
                 continue
 
-            annotation["alias"] = annotation["name"]
-            annotation["name"] = replacement
+            annotation.alias = annotation.name
+            entity.rename_annotation(annotation, replacement)
@@ -1,38 +1,59 @@
 import re
 
-from butcher.common_types import AnyDict, RegistryType
+from butcher.common_types import RegistryType
+from butcher.parsers.entities.model import Entity, Returning
 from butcher.parsers.entities.resolvers.annotation_type import parse_type
 from butcher.parsers.entities.resolvers.base import EntityResolver
 
 RE_FLAGS = re.IGNORECASE
+# Patterns in the order of priority with a literal every their match contains,
+# the pattern is searched only when the sentence contains the literal
 RETURN_PATTERNS = [
-    re.compile(item, flags=RE_FLAGS)
-    for item in [
-        r"(?P<type>[a-z]+) is returned, otherwise (?P<other>[a-zA-Z]+) is returned",
-        r"returns the edited (?P<type>[a-z]+), otherwise returns (?P<other>[a-zA-Z]+)",
-        r"On success, the stopped (?P<type>[a-z]+) with the final results is returned",
-        r"On success, an (?P<type>array of [a-z]+)s that were sent is returned",
-        r"Returns the (?P<type>[a-z]+) of the sent message on success",
-        r"(?P<type>Array of [a-z]+) objects",
-        r"Returns (?P<type>Array of [a-z]+) on success",
-        r"a (?P<type>[a-z]+) object",
-        r"Returns (?P<type>[a-z]+) on success",
-        r"(?P<type>[a-z]+) on success",
-        r"(?P<type>[a-z]+) is returned",
-        r"Returns the [a-z ]+ as (?P<type>[a-z]+) object",
-        r"Returns (?P<type>[a-z]+)",
+    (keyword, re.compile(pattern, flags=RE_FLAGS))
+    for keyword, pattern in [
+        (
+            " is returned, otherwise ",
+            r"(?P<type>[a-z]+) is returned, otherwise (?P<other>[a-zA-Z]+) is returned",
+        ),
+        (
+            "returns the edited ",
+            r"returns the edited (?P<type>[a-z]+), otherwise returns (?P<other>[a-zA-Z]+)",
+        ),
+        (
+            " with the final results is returned",
+            r"On success, the stopped (?P<type>[a-z]+) with the final results is returned",
+        ),
+        (
+            "s that were sent is returned",
+            r"On success, an (?P<type>array of [a-z]+)s that were sent is returned",
+        ),
+        (
+            " of the sent message on success",
+            r"Returns the (?P<type>[a-z]+) of the sent message on success",
+        ),
+        ("array of ", r"(?P<type>Array of [a-z]+) objects"),
+        ("returns array of ", r"Returns (?P<type>Array of [a-z]+) on success"),
+        (" object", r"a (?P<type>[a-z]+) object"),
+        (" on success", r"Returns (?P<type>[a-z]+) on success"),
+        (" on success", r"(?P<type>[a-z]+) on success"),
+        (" is returned", r"(?P<type>[a-z]+) is returned"),
+        ("returns the ", r"Returns the [a-z ]+ as (?P<type>[a-z]+) object"),
+        ("returns ", r"Returns (?P<type>[a-z]+)"),
     ]
 ]
 
 
 class ReturningTypeResolver(EntityResolver):
-    def resolve(self, registry: RegistryType, entity: AnyDict) -> None:
-        type_, description = parse_returning(entity["object"]["description"])
-        entity["object"]["returning"] = {
-            "type": type_,
-            "parsed_type": parse_type(type_),
-            "description": description,
-        }
+    reads = frozenset({"description"})
+    writes = frozenset({"returning"})
+
+    def resolve(self, registry: RegistryType, entity: Entity) -> None:
+        type_, description = parse_returning(entity.description)
+        entity.returning = Returning(
+            type=type_,
+            parsed_type=parse_type(type_),
+            description=description,
+        )
 
 
 def parse_returning(description: str):
@@ -42,11 +63,14 @@ def parse_returning(description: str):
     sentence = ". ".join(map(str.strip, parts))
     return_type = None
 
-    for pattern in RETURN_PATTERNS:
-        temp = pattern.search(sentence)
-        if temp:
+    # Case folding matches the case-insensitive matching of the patterns
+    folded = sentence.casefold()
+    for keyword, pattern in RETURN_PATTERNS:
+        if keyword not in folded:
+            continue
+        if temp := pattern.search(sentence):
             return_type = temp.group("type")
-            if "other" in temp.groupdict():
+            if "other" in pattern.groupindex:
                 otherwise = temp.group("other")
                 return_type += f" or {otherwise}"
         if return_type:
@@ -0,0 +1,84 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from butcher.parsers.entities.dependencies import Access, EntityKey
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class ResolveTask:
+    """
+    One resolver applied to one entity (or one enum being resolved)
+    with the fields of the entities it reads and writes
+    """
+
+    key: EntityKey
+    run: Callable[[], None]
+    accesses: list[Access]
+    dependencies: set["ResolveTask"] = field(default_factory=set)
+    dependents: list["ResolveTask"] = field(default_factory=list)
+
+
+def link_tasks(tasks: list[ResolveTask]) -> None:
+    """
+    Build the graph of the tasks keeping the order they are listed in
+    for the tasks accessing the same field of the same entity:
+    a task reading the field waits for the last task writing it,
+    a task writing the field also waits for the tasks reading it since then
+    """
+    writers: dict[tuple[EntityKey, str], ResolveTask] = {}
+    readers: dict[tuple[EntityKey, str], list[ResolveTask]] = {}
+
+    for task in tasks:
+        for key, reads, writes in task.accesses:
+            for field_name in reads | writes:
+                slot = key, field_name
+                if writer := writers.get(slot):
+                    task.dependencies.add(writer)
+                if field_name in writes:
+                    task.dependencies.update(readers.pop(slot, []))
+                    writers[slot] = task
+                else:
+                    readers.setdefault(slot, []).append(task)
+        task.dependencies.discard(task)
+        for dependency in task.dependencies:
+            dependency.dependents.append(task)
+
+
+def run_tasks(tasks: list[ResolveTask], workers: int) -> None:
+    """
+    Run the linked tasks, each task is started as soon as all its dependencies are done
+    """
+    if workers <= 1:
+        # Listed order is already a topological order of the graph
+        for task in tasks:
+            task.run()
+        return
+
+    waiting = {task: len(task.dependencies) for task in tasks}
+    ready = [task for task, count in waiting.items() if not count]
+    running: dict[Future, ResolveTask] = {}
+    done_count = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while ready or running:
+            for task in ready:
+                running[executor.submit(task.run)] = task
+            ready = []
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                future.result()
+                done_count += 1
+                for dependent in task.dependents:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+
+    if done_count != len(tasks):
+        raise RuntimeError(f"Resolver graph is not acyclic, {len(tasks) - done_count} tasks left")
+    logger.debug("Resolved %d tasks with %d workers", len(tasks), workers)
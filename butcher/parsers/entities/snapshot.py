@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TypeAlias
+
+from butcher.cache import fingerprint_files, resolve_cache_path
+from butcher.common_types import AnyDict, RegistryType
+from butcher.parsers.entities.dependencies import EntityKey
+
+logger = logging.getLogger(__name__)
+
+InputRecord: TypeAlias = tuple[int, int, str]
+SourcesType: TypeAlias = dict[EntityKey, list[Path]]
+
+# Snapshot is dropped when the code producing the registry is changed
+SNAPSHOT_CODE = [
+    Path(__file__).parent,
+    Path(__file__).parent.parent / "enum.py",
+    Path(__file__).parent.parent.parent / "data.py",
+]
+
+
+@dataclass
+class SnapshotState:
+    # Size, mtime and digest of the input files grouped by the entity they belong to
+    inputs: dict[EntityKey, dict[str, InputRecord]] = field(default_factory=dict)
+    # Entities and enum configs as they are loaded from the disk, before resolving
+    raw: bytes = b""
+    registry: RegistryType = field(default_factory=dict)
+
+
+class RegistrySnapshot:
+    """
+    Fully resolved registry persisted between the runs
+    and validated by the files it was built from
+    """
+
+    def __init__(self, path: Path, project_dir: Path) -> None:
+        self.path = path
+        self.project_dir = project_dir
+
+    @classmethod
+    def from_project(cls, project_dir: Path) -> "RegistrySnapshot":
+        return cls(
+            path=resolve_cache_path(project_dir, "registry.pickle"), project_dir=project_dir
+        )
+
+    def _code_fingerprint(self) -> str:
+        paths = []
+        for path in SNAPSHOT_CODE:
+            paths.extend(path.glob("**/*.py") if path.is_dir() else [path])
+        return fingerprint_files(paths)
+
+    def load(self) -> SnapshotState | None:
+        try:
+            with self.path.open("rb") as f:
+                code, state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Registry snapshot %s is broken: %s", self.path, e)
+            return None
+        if code != self._code_fingerprint():
+            logger.debug("Registry snapshot is outdated")
+            return None
+        return state
+
+    def save(self, state: SnapshotState) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((self._code_fingerprint(), state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+    def check_inputs(
+        self, state: SnapshotState | None, sources: SourcesType
+    ) -> tuple[set[EntityKey], dict[EntityKey, dict[str, InputRecord]]]:
+        """
+        Compare input files with the snapshot,
+        files are hashed only when their size or modification time is changed
+
+        :return: keys of the changed, added or removed entities and the actual inputs
+        """
+        previous = state.inputs if state else {}
+        changed = set(previous.keys() - sources.keys())
+        inputs = {}
+
+        for key, paths in sources.items():
+            previous_records = previous.get(key, {})
+            records = inputs[key] = {}
+            for path in paths:
+                name = path.relative_to(self.project_dir).as_posix()
+                stat = path.stat()
+                record = previous_records.get(name)
+                if record and record[:2] == (stat.st_size, stat.st_mtime_ns):
+                    records[name] = record
+                    continue
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+                records[name] = (stat.st_size, stat.st_mtime_ns, digest)
+                if not record or record[2] != digest:
+                    changed.add(key)
+            if records.keys() != previous_records.keys():
+                changed.add(key)
+
+        return changed, inputs
+
+
+def dump_raw(raw: AnyDict) -> bytes:
+    return pickle.dumps(raw, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_raw(raw: bytes) -> AnyDict:
+    return pickle.loads(raw)
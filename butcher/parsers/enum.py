@@ -1,9 +1,11 @@
 import re
+from functools import lru_cache
 
 from butcher.common_types import AnyDict, RegistryType
+from butcher.parsers.entities.model import Annotation, Entity
 
 
-def resolve_enum(registry: RegistryType, enum_config: AnyDict):
+def resolve_enum(registry: RegistryType, enum_config: AnyDict) -> Entity:
     enum_name = enum_config["name"]
     enum_type = enum_config.get("type", "str")
     bases = [enum_type, "Enum"]
@@ -15,18 +17,13 @@ def resolve_enum(registry: RegistryType, enum_config: AnyDict):
 
     if enum_parse := enum_config.get("parse"):
         source_entity = registry[enum_parse.get("category", "types")][enum_parse["entity"]]
-        source_annotation = next(
-            filter(
-                lambda item: item["name"] == enum_parse["attribute"],
-                source_entity["object"]["annotations"],
-            )
-        )
+        source_annotation = extract_annotation(source_entity, enum_parse["attribute"])
         description_format = enum_parse.get("format", "")
         if description_format:
             description_format += "_"
-        source = source_annotation[f"{description_format}description"]
-        pattern = enum_parse["regexp"]
-        for item in re.findall(pattern, source):
+        source = getattr(source_annotation, f"{description_format}description")
+        pattern = compile_pattern(enum_parse["regexp"])
+        for item in pattern.findall(source):
             values[item.upper()] = item
             update_const(source_annotation, enum_name, item)
 
@@ -34,14 +31,15 @@ def resolve_enum(registry: RegistryType, enum_config: AnyDict):
         category = enum_multi_parse.get("category", "types")
         annotation_name = enum_multi_parse["attribute"]
         entities = enum_multi_parse["entities"]
-        pattern = enum_multi_parse["regexp"]
+        pattern = compile_pattern(enum_multi_parse["regexp"])
         description_format = enum_multi_parse.get("format", "")
         if description_format:
             description_format += "_"
         for entity_name in entities:
             source_entity = registry[category][entity_name]
             source_annotation = extract_annotation(source_entity, annotation_name)
-            if item := re.search(pattern, source_annotation[f"{description_format}description"]):
+            source = getattr(source_annotation, f"{description_format}description")
+            if item := pattern.search(source):
                 value = item.group(1)
                 values[value.upper()] = value
 
@@ -52,38 +50,37 @@ def resolve_enum(registry: RegistryType, enum_config: AnyDict):
         source_entity = registry["types"][enum_extract["entity"]]
         values.update(
             {
-                annotation["name"].upper(): annotation["name"]
-                for annotation in source_entity["object"]["annotations"]
-                if annotation["name"] not in exclude
+                annotation.name.upper(): annotation.name
+                for annotation in source_entity.annotations
+                if annotation.name not in exclude
             }
         )
 
-    result = {
-        "meta": {},
-        "object": {
-            "name": enum_config["name"],
-            "type": enum_type,
-            "bases": bases,
-            "description": enum_config["description"],
-            "html_description": enum_config["description"],
-            "rst_description": enum_config["description"].strip(),
-            "docs": enum_config.get("docs"),
-            "values": values,
-            "category": "enums",
-        },
-    }
-    return result
-
-
-def extract_annotation(entity: AnyDict, name: str) -> AnyDict:
-    annotation = next(
-        filter(
-            lambda item: item["name"] == name,
-            entity["object"]["annotations"],
-        )
+    return Entity(
+        meta={},
+        name=enum_config["name"],
+        type=enum_type,
+        bases=bases,
+        description=enum_config["description"],
+        html_description=enum_config["description"],
+        rst_description=enum_config["description"].strip(),
+        docs=enum_config.get("docs"),
+        values=values,
+        category="enums",
     )
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def extract_annotation(entity: Entity, name: str) -> Annotation:
+    annotation = entity.find_annotation(name)
+    if annotation is None:
+        raise ValueError(f"Entity {entity.name!r} has no annotation {name!r}")
     return annotation
 
 
-def update_const(annotation: AnyDict, enum: str, value: str) -> None:
-    annotation["enum_value"] = f"{enum}.{value.upper()}"
+def update_const(annotation: Annotation, enum: str, value: str) -> None:
+    annotation.enum_value = f"{enum}.{value.upper()}"
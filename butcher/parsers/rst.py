@@ -1,82 +1,114 @@
-from typing import Generator, Iterable
+import re
+from urllib.parse import urljoin
 
 from lxml.html import HtmlElement
 
 from butcher.codegen.generators.pythonize import pythonize_name
 from butcher.parsers.consts import REF_LINKS, SYMBOLS_MAP
 
+RST_REPLACEMENTS = {
+    "*True*": ":code:`True`",
+    "*False*": ":code:`False`",
+    "_*": "_ *",
+    **SYMBOLS_MAP,
+}
+# Replacements are made in one pass,
+# "_*" is not replaced when it starts "*True*"/"*False*" that is replaced first
+RST_REPLACEMENTS_PATTERN = re.compile(
+    "|".join(
+        [
+            r"\*True\*",
+            r"\*False\*",
+            r"_\*(?!True\*|False\*)",
+            *map(re.escape, SYMBOLS_MAP),
+        ]
+    )
+)
+
 
 def node_to_rst(node: HtmlElement) -> str:
-    result = "".join(_node_to_rst(node))
-    for a, b in {
-        "*True*": ":code:`True`",
-        "*False*": ":code:`False`",
-        "_*": "_ *",
-        **SYMBOLS_MAP,
-    }.items():
-        result = result.replace(a, b)
-    return result
+    return RST_REPLACEMENTS_PATTERN.sub(_replace, _render_rst(node))
+
+
+def _replace(match: re.Match) -> str:
+    return RST_REPLACEMENTS[match.group()]
 
 
-def _nodes_to_rst(nodes: Iterable[HtmlElement]) -> Generator[str, None, None]:
-    for node in nodes:
-        yield from _node_to_rst(node)
+def _render_rst(root: HtmlElement) -> str:
+    """
+    Render node into the one buffer using an explicit stack,
+    the stack holds nodes to render, strings to write
+    and buffer positions where the blockquote content starts
+    """
+    buffer: list[str] = []
+    stack: list[HtmlElement | str | int] = [root]
 
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            buffer.append(node)
+            continue
+        if isinstance(node, int):
+            value = "".join(buffer[node:])
+            del buffer[node:]
+            value = " " + "\n ".join(value.split("\n"))
+            buffer.append(value.rstrip() + "\n")
+            continue
 
-def _node_to_rst(node: HtmlElement) -> str:
-    # TODO: Blockquote's
-    tag = node.tag
-    tail = ""
-    if tag in {"p", "td"}:
-        yield node.text or ""
-    elif tag == "a":
-        href = node.attrib["href"]
-        if (
-            node.text
-            and href.startswith("#")
-            and "-" not in href
-            and f"#{node.text.lower()}" == href
-        ):
-            ref_name = node.text
-            ref_group = "types" if ref_name[0].isupper() else "methods"
-            yield f":class:`aiogram.{ref_group}.{pythonize_name(ref_name)}.{ref_name[0].upper()}{ref_name[1:]}`"
-        elif href in REF_LINKS:
-            yield f":ref:`{node.text or href} <{REF_LINKS[href]}>`"
-        else:
-            node.make_links_absolute()
+        # TODO: Blockquote's
+        tag = node.tag
+        tail = ""
+        if tag in {"p", "td"}:
+            buffer.append(node.text or "")
+        elif tag == "a":
             href = node.attrib["href"]
-            yield f"`{node.text or href} <{href}>`_"
-    elif tag == "img":
-        yield node.attrib["alt"]
-    elif tag in {"br", "blockquote"}:
-        yield "\n"
-    elif tag == "ul":
-        if node.text:
-            yield node.text
-    elif tag == "li":
-        yield " - "
-        if node.text:
-            yield node.text
-    elif tag == "strong":
-        yield "**"
-        tail = "**"
-        yield node.text
-    elif tag == "em":
-        yield "*"
-        tail = "*"
-        yield node.text
-    elif tag == "code":
-        yield f":code:`{node.text_content()}`"
+            if (
+                node.text
+                and href.startswith("#")
+                and "-" not in href
+                and f"#{node.text.lower()}" == href
+            ):
+                ref_name = node.text
+                ref_group = "types" if ref_name[0].isupper() else "methods"
+                buffer.append(
+                    f":class:`aiogram.{ref_group}.{pythonize_name(ref_name)}.{ref_name[0].upper()}{ref_name[1:]}`"
+                )
+            elif href in REF_LINKS:
+                buffer.append(f":ref:`{node.text or href} <{REF_LINKS[href]}>`")
+            else:
+                # Same as `node.make_links_absolute()` without rewriting the tree,
+                # which searches the whole document for the <base> tag on each call
+                href = urljoin(node.base_url, href.strip())
+                buffer.append(f"`{node.text or href} <{href}>`_")
+        elif tag == "img":
+            buffer.append(node.attrib["alt"])
+        elif tag in {"br", "blockquote"}:
+            buffer.append("\n")
+        elif tag == "ul":
+            if node.text:
+                buffer.append(node.text)
+        elif tag == "li":
+            buffer.append(" - ")
+            if node.text:
+                buffer.append(node.text)
+        elif tag == "strong":
+            buffer.append("**")
+            tail = "**"
+            buffer.append(node.text)
+        elif tag == "em":
+            buffer.append("*")
+            tail = "*"
+            buffer.append(node.text)
+        elif tag == "code":
+            buffer.append(f":code:`{node.text_content()}`")
 
-    if tag == "blockquote":
-        value = "".join(_nodes_to_rst(node))
-        value.split("\n")
-        value = " " + "\n ".join(value.split("\n"))
-        yield value.rstrip() + "\n"
-    else:
-        yield from _nodes_to_rst(node)
+        # Pushed in reverse order: children, closing markup and then the tail
+        if node.tail:
+            stack.append(node.tail)
+        if tail:
+            stack.append(tail)
+        if tag == "blockquote":
+            stack.append(len(buffer))
+        stack.extend(reversed(node))
 
-    if tail:
-        yield tail
-    if node.tail:
-        yield node.tail
+    return "".join(buffer)
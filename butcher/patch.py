@@ -0,0 +1,144 @@
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Iterator, Sequence, TextIO
+
+Opcode = tuple[str, int, int, int, int]
+
+DEFAULT_CONTEXT = 3
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+
+def _hash_lines(a: Sequence[str], b: Sequence[str]) -> tuple[list[int], list[int]]:
+    """
+    Lines replaced by their ids, equal lines have equal ids,
+    so the lines are compared as integers and are not hashed again by the matcher
+    """
+    ids: dict[str, int] = {}
+    return (
+        [ids.setdefault(line, len(ids)) for line in a],
+        [ids.setdefault(line, len(ids)) for line in b],
+    )
+
+
+def diff_opcodes(a: Sequence[str], b: Sequence[str]) -> list[Opcode]:
+    """
+    Opcodes of the lines diff in the SequenceMatcher format,
+    common prefix and suffix are skipped, so only the changed region of the file is matched
+    """
+    a_ids, b_ids = _hash_lines(a, b)
+    size = min(len(a_ids), len(b_ids))
+    prefix = 0
+    while prefix < size and a_ids[prefix] == b_ids[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < size - prefix and a_ids[-1 - suffix] == b_ids[-1 - suffix]:
+        suffix += 1
+
+    opcodes: list[Opcode] = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    matcher = SequenceMatcher(
+        None, a_ids[prefix : len(a_ids) - suffix], b_ids[prefix : len(b_ids) - suffix]
+    )
+    # Bounds of the changed region are different lines, so its opcodes start and end with changes
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", len(a_ids) - suffix, len(a_ids), len(b_ids) - suffix, len(b_ids)))
+    return opcodes
+
+
+def _group_opcodes(opcodes: list[Opcode], context: int) -> Iterator[list[Opcode]]:
+    """
+    Hunks of the changes with the given number of context lines,
+    same grouping as SequenceMatcher.get_grouped_opcodes has
+    """
+    codes = list(opcodes)
+    if codes and codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes and codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _format_lines(prefix: str, lines: Sequence[str]) -> Iterator[str]:
+    for line in lines:
+        yield f"{prefix}{line}"
+        if not line.endswith("\n"):
+            yield f"\n{NO_NEWLINE_MARKER}"
+
+
+def unified_patch(
+    path: str, a: str, b: str, new_file: bool = False, context: int = DEFAULT_CONTEXT
+) -> str:
+    """
+    Unified diff of the file with the a/ and b/ prefixes of the paths,
+    which can be applied by `git apply` or `patch -p1`
+    """
+    if a == b:
+        return ""
+    a_lines = a.splitlines(keepends=True)
+    b_lines = b.splitlines(keepends=True)
+    output = [f"--- {'/dev/null' if new_file else f'a/{path}'}\n", f"+++ b/{path}\n"]
+    for group in _group_opcodes(diff_opcodes(a_lines, b_lines), context=context):
+        first, last = group[0], group[-1]
+        output.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                output.extend(_format_lines(" ", a_lines[i1:i2]))
+                continue
+            if tag in {"replace", "delete"}:
+                output.extend(_format_lines("-", a_lines[i1:i2]))
+            if tag in {"replace", "insert"}:
+                output.extend(_format_lines("+", b_lines[j1:j2]))
+    return "".join(output)
+
+
+class PatchWriter:
+    """
+    Combined patch of the generated files.
+
+    Diff of each file is written to the stream as soon as the file is rendered,
+    paths are relative to the current directory when it is possible
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.files = 0
+
+    def write(self, path: Path, old: str, new: str) -> None:
+        if old == new:
+            return
+        new_file = not old and not path.exists()
+        if path.is_absolute():
+            try:
+                path = path.relative_to(Path.cwd())
+            except ValueError:
+                pass
+        self.stream.write(unified_patch(path.as_posix(), old, new, new_file=new_file))
+        self.stream.flush()
+        self.files += 1
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Iterator, Sequence
+
+import black
+
+from butcher.codegen.formatter import format_code
+from butcher.codegen.manager import CodegenManager
+from butcher.docs.manager import DocsManager
+from butcher.stats import StageStats
+
+DEFAULT_CAPACITY = 16
+
+
+@dataclass
+class RenderedEntity:
+    name: str
+    code_path: Path
+    old_code: str
+    new_code: str
+    docs_path: Path
+    old_docs: str
+    new_docs: str
+
+
+@dataclass
+class _LoadedEntity:
+    name: str
+    code_path: Path
+    code: str
+    docs_path: Path
+    docs: str
+
+
+# Marks the end of the loaded entities in the queue
+_DONE = object()
+
+
+def _format_in_worker(code: str, mode: black.FileMode) -> tuple[str, float]:
+    started_at = time.perf_counter()
+    return format_code(code, mode=mode), time.perf_counter() - started_at
+
+
+class ApplyPipeline:
+    """
+    Staged rendering of the entities of one category.
+
+    Code and docs are read by the reader thread, entities are transformed in the current process
+    and the code is formatted by black in the pool of worker processes when it is given,
+    rendered entities are yielded in the same order as names are given.
+
+    Both queues between the stages are bounded by the capacity, so the reader waits
+    while the transform stage is behind and the transform stage waits for the oldest
+    formatted entity while the pool is behind
+    """
+
+    def __init__(
+        self,
+        code_manager: CodegenManager,
+        docs_manager: DocsManager,
+        category: str,
+        executor: Executor | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        self.code_manager = code_manager
+        self.docs_manager = docs_manager
+        self.category = category
+        self.executor = executor
+        self.capacity = capacity
+
+        self.read_stats = StageStats("read")
+        self.transform_stats = StageStats("transform")
+        self.format_stats = StageStats("format")
+
+    @property
+    def stats(self) -> list[StageStats]:
+        return [self.read_stats, self.transform_stats, self.format_stats]
+
+    def _load(self, name: str) -> _LoadedEntity:
+        code_path = self.code_manager.entity_path(self.category, name=name)
+        docs_path = self.docs_manager.entity_path("api", self.category, name=name)
+        return _LoadedEntity(
+            name=name,
+            code_path=code_path,
+            code=self.code_manager.read_code(code_path),
+            docs_path=docs_path,
+            docs=self.docs_manager.read_code(docs_path),
+        )
+
+    def _read(self, names: Sequence[str], loaded: Queue, stop: threading.Event) -> None:
+        try:
+            for name in names:
+                if stop.is_set():
+                    return
+                with self.read_stats.measure():
+                    item = self._load(name)
+                loaded.put(item)
+                # Size is taken after the put, so the item held by the blocked reader
+                # is not counted and the depth never exceeds the capacity
+                self.read_stats.observe(loaded.qsize())
+        except BaseException as e:
+            loaded.put(e)
+        else:
+            loaded.put(_DONE)
+
+    def _format(self, code: str) -> Future:
+        if self.executor is not None:
+            return self.executor.submit(
+                _format_in_worker, code, mode=self.code_manager.get_black_mode()
+            )
+        future: Future = Future()
+        future.set_result(_format_in_worker(code, mode=self.code_manager.get_black_mode()))
+        return future
+
+    def _transform(self, item: _LoadedEntity) -> tuple[RenderedEntity, str | None, Future | None]:
+        new_code, formatted = self.code_manager.render_entity(
+            category=self.category, name=item.name, code=item.code
+        )
+        key = future = None
+        if not formatted:
+            key, cached = self.code_manager.lookup_format(new_code)
+            if cached is not None:
+                new_code = cached
+            else:
+                future = self._format(new_code)
+                self.format_stats.enqueue()
+        new_docs = self.docs_manager.render_entity(
+            category=self.category, name=item.name, docs=item.docs
+        )
+        entity = RenderedEntity(
+            name=item.name,
+            code_path=item.code_path,
+            old_code=item.code,
+            new_code=new_code,
+            docs_path=item.docs_path,
+            old_docs=item.docs,
+            new_docs=new_docs,
+        )
+        return entity, key, future
+
+    def _finish(
+        self, entity: RenderedEntity, key: str | None, future: Future | None
+    ) -> RenderedEntity:
+        if future is None:
+            return entity
+        entity.new_code, elapsed = future.result()
+        self.format_stats.dequeue()
+        self.format_stats.add(elapsed)
+        self.code_manager.format_cache.put(key, entity.new_code)
+        return entity
+
+    def run(self, names: Sequence[str]) -> Iterator[RenderedEntity]:
+        loaded: Queue = Queue(maxsize=self.capacity)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read, args=(names, loaded, stop), name="reader", daemon=True
+        )
+        reader.start()
+        pending: deque[tuple[RenderedEntity, str | None, Future | None]] = deque()
+        try:
+            while (item := loaded.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                with self.transform_stats.measure():
+                    pending.append(self._transform(item))
+                # Oldest entity is awaited when the queue is full, the formatted ones are
+                # passed on as soon as they are at the head of the queue
+                while pending and (len(pending) >= self.capacity or _is_ready(pending[0])):
+                    yield self._finish(*pending.popleft())
+            while pending:
+                yield self._finish(*pending.popleft())
+        finally:
+            stop.set()
+            # Reader can be blocked by the full queue when the consumer is interrupted
+            while reader.is_alive():
+                try:
+                    loaded.get(timeout=0.1)
+                except Empty:
+                    pass
+
+
+def _is_ready(item: tuple[RenderedEntity, str | None, Future | None]) -> bool:
+    future = item[2]
+    return future is None or future.done()
@@ -1,15 +1,24 @@
-import difflib
+import logging
+import sys
 import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 
 import click
 from alive_progress import alive_bar
 from click import Context, Parameter, pass_context
 
+from butcher.cache import Manifest
 from butcher.codegen.manager import CodegenManager
 from butcher.docs.manager import DocsManager
 from butcher.parsers.entities.generator import EntitiesRegistry
+from butcher.patch import PatchWriter
+from butcher.pipeline import ApplyPipeline
 from butcher.shell.config import ProjectConfig, pass_config
+from butcher.writer import FileWriter
+
+logger = logging.getLogger(__name__)
 
 pass_registry = click.make_pass_decorator(EntitiesRegistry)
 
@@ -24,9 +33,7 @@ class EntityNameType(click.ParamType):
         self, value: t.Any, param: t.Optional["Parameter"], ctx: t.Optional["Context"]
     ) -> t.Any:
         registry = ctx.ensure_object(EntitiesRegistry)
-        try:
-            registry.registry[self.category][value]
-        except KeyError:
+        if not registry.is_known(self.category, value):
             self.fail(f"entity {value!r} is not known in category {self.category!r}")
         return super().convert(value, param, ctx)
 
@@ -38,9 +45,8 @@ def group_apply(ctx: Context, config: ProjectConfig):
     """
     Apply changes to the code
     """
-    registry = EntitiesRegistry(project_dir=config.project_dir)
-    registry.initialize()
-    ctx.obj = registry
+    # Registry is initialized by the commands, so only requested entities can be resolved
+    ctx.obj = EntitiesRegistry(project_dir=config.project_dir, resolve_workers=config.resolve_jobs)
 
 
 @group_apply.command("type")
@@ -53,17 +59,52 @@ def group_apply(ctx: Context, config: ProjectConfig):
     "--diff",
     is_flag=True,
     default=False,
-    help="Show diff instead of applying changes",
+    help="Write combined patch to stdout instead of applying changes",
+)
+@click.option(
+    "--patch-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write combined patch to the file instead of applying changes",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of formatting worker processes, 1 formats in-process, 0 means all CPUs",
 )
 @pass_config
 @pass_registry
 def command_apply_type(
-    registry: EntitiesRegistry, config: ProjectConfig, diff: bool, names: tuple[str, ...]
+    registry: EntitiesRegistry,
+    config: ProjectConfig,
+    diff: bool,
+    patch_out: Path | None,
+    jobs: int,
+    names: tuple[str, ...],
 ):
     """
     Generate types
     """
-    _apply(registry=registry, config=config, diff=diff, category="types", names=names)
+    registry.initialize(category="types", names=names)
+    with _output(config=config, diff=diff, patch_out=patch_out, jobs=jobs) as (
+        manifest,
+        writer,
+        patch,
+        executor,
+    ):
+        _apply(
+            registry=registry,
+            config=config,
+            manifest=manifest,
+            writer=writer,
+            patch=patch,
+            executor=executor,
+            category="types",
+            names=names,
+        )
 
 
 @group_apply.command("method")
@@ -76,17 +117,52 @@ def command_apply_type(
     "--diff",
     is_flag=True,
     default=False,
-    help="Show diff instead of applying changes",
+    help="Write combined patch to stdout instead of applying changes",
+)
+@click.option(
+    "--patch-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write combined patch to the file instead of applying changes",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of formatting worker processes, 1 formats in-process, 0 means all CPUs",
 )
 @pass_config
 @pass_registry
 def command_apply_method(
-    registry: EntitiesRegistry, config: ProjectConfig, diff: bool, names: tuple[str, ...]
+    registry: EntitiesRegistry,
+    config: ProjectConfig,
+    diff: bool,
+    patch_out: Path | None,
+    jobs: int,
+    names: tuple[str, ...],
 ):
     """
     Generate methods
     """
-    _apply(registry=registry, config=config, diff=diff, category="methods", names=names)
+    registry.initialize(category="methods", names=names)
+    with _output(config=config, diff=diff, patch_out=patch_out, jobs=jobs) as (
+        manifest,
+        writer,
+        patch,
+        executor,
+    ):
+        _apply(
+            registry=registry,
+            config=config,
+            manifest=manifest,
+            writer=writer,
+            patch=patch,
+            executor=executor,
+            category="methods",
+            names=names,
+        )
 
 
 @group_apply.command("enum")
@@ -99,17 +175,52 @@ def command_apply_method(
     "--diff",
     is_flag=True,
     default=False,
-    help="Show diff instead of applying changes",
+    help="Write combined patch to stdout instead of applying changes",
+)
+@click.option(
+    "--patch-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write combined patch to the file instead of applying changes",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of formatting worker processes, 1 formats in-process, 0 means all CPUs",
 )
 @pass_config
 @pass_registry
 def command_apply_enum(
-    registry: EntitiesRegistry, config: ProjectConfig, diff: bool, names: tuple[str, ...]
+    registry: EntitiesRegistry,
+    config: ProjectConfig,
+    diff: bool,
+    patch_out: Path | None,
+    jobs: int,
+    names: tuple[str, ...],
 ):
     """
     Generate enums
     """
-    _apply(registry=registry, config=config, diff=diff, category="enums", names=names)
+    registry.initialize(category="enums", names=names)
+    with _output(config=config, diff=diff, patch_out=patch_out, jobs=jobs) as (
+        manifest,
+        writer,
+        patch,
+        executor,
+    ):
+        _apply(
+            registry=registry,
+            config=config,
+            manifest=manifest,
+            writer=writer,
+            patch=patch,
+            executor=executor,
+            category="enums",
+            names=names,
+        )
 
 
 @group_apply.command("all")
@@ -117,124 +228,209 @@ def command_apply_enum(
     "--diff",
     is_flag=True,
     default=False,
-    help="Show diff instead of applying changes",
+    help="Write combined patch to stdout instead of applying changes",
+)
+@click.option(
+    "--patch-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write combined patch to the file instead of applying changes",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of formatting worker processes, 1 formats in-process, 0 means all CPUs",
 )
 @pass_config
 @pass_registry
-def command_apply_all(registry: EntitiesRegistry, config: ProjectConfig, diff: bool):
+def command_apply_all(
+    registry: EntitiesRegistry,
+    config: ProjectConfig,
+    diff: bool,
+    patch_out: Path | None,
+    jobs: int,
+):
     """
     Generate all entities
     """
-    _apply(registry=registry, config=config, diff=diff, category="types", names=())
-    _apply(registry=registry, config=config, diff=diff, category="methods", names=())
-    _apply(registry=registry, config=config, diff=diff, category="enums", names=())
-    _apply_bot(registry=registry, config=config, diff=diff)
+    registry.initialize()
+    with _output(config=config, diff=diff, patch_out=patch_out, jobs=jobs) as (
+        manifest,
+        writer,
+        patch,
+        executor,
+    ):
+        for category in ("types", "methods", "enums"):
+            _apply(
+                registry=registry,
+                config=config,
+                manifest=manifest,
+                writer=writer,
+                patch=patch,
+                executor=executor,
+                category=category,
+                names=(),
+            )
+        _apply_bot(registry=registry, config=config, manifest=manifest, writer=writer, patch=patch)
+
+
+@contextmanager
+def _output(
+    config: ProjectConfig,
+    diff: bool,
+    patch_out: Path | None = None,
+    jobs: int | None = None,
+) -> t.Iterator[
+    tuple[Manifest, FileWriter | None, PatchWriter | None, ProcessPoolExecutor | None]
+]:
+    """
+    Manifest, writer and the pool of formatting workers shared by the categories of the command.
+
+    Files are written when the command is done and the manifest is saved after them,
+    in diff mode nothing is written and the combined patch is written to stdout or to the file
+    """
+    manifest = Manifest.from_project(config.project_dir)
+    with ExitStack() as stack:
+        executor = None
+        # Single job formats in the current process without forking the worker
+        if jobs is not None and jobs != 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs or None))
+            # Workers are forked before the threads of the pipeline and the writer are started
+            executor.submit(int).result()
+        writer = patch = None
+        if patch_out is not None:
+            patch = PatchWriter(stack.enter_context(patch_out.open("w")))
+        elif diff:
+            patch = PatchWriter(sys.stdout)
+        else:
+            writer = stack.enter_context(FileWriter())
+        yield manifest, writer, patch, executor
+    if patch is not None:
+        logger.info("Patch of %d files is written", patch.files)
+    if writer is not None:
+        logger.info("Stage %s", writer.stats)
+        manifest.save()
 
 
 def _apply(
     registry: EntitiesRegistry,
     config: ProjectConfig,
-    diff: bool,
+    manifest: Manifest,
+    writer: FileWriter | None,
+    patch: PatchWriter | None,
+    executor: ProcessPoolExecutor | None,
     category: str,
     names: tuple[str, ...],
 ):
     if not names:
         names = tuple(registry.registry[category].keys())
-    code_manager = CodegenManager(config=config, registry=registry)
-    docs_manager = DocsManager(config=config, registry=registry)
+    code_manager = CodegenManager(config=config, registry=registry, manifest=manifest)
+    docs_manager = DocsManager(config=config, registry=registry, manifest=manifest)
+    pipeline = ApplyPipeline(
+        code_manager=code_manager,
+        docs_manager=docs_manager,
+        category=category,
+        executor=executor,
+    )
     with alive_bar(
         len(names) + 1,
         # dual_line=True,
         title=f"Rendering {category}...",
         enrich_print=False,
+        file=sys.stderr,
         title_length=20,
     ) as progress:
-        for name in names:
-            progress.text = f"Rendering {name}"
-            code_path, old_code, new_code = code_manager.process_entity(
-                category=category, name=name
-            )
-            docs_path, old_docs, new_docs = docs_manager.process_entity(
-                category=category, name=name
-            )
-
-            if diff:
-                _diff_in_progress(code_path, old_code, new_code, progress)
-                _diff_in_progress(docs_path, old_docs, new_docs, progress)
+        for entity in pipeline.run(names):
+            progress.text = f"Rendered {entity.name}"
+            if writer is None:
+                patch.write(entity.code_path, entity.old_code, entity.new_code)
+                patch.write(entity.docs_path, entity.old_docs, entity.new_docs)
             else:
-                code_path.write_text(new_code)
-                docs_path.write_text(new_docs)
+                writer.write(entity.code_path, entity.new_code)
+                writer.write(entity.docs_path, entity.new_docs)
+                code_manager.remember_entity(
+                    category=category, name=entity.name, code=entity.new_code
+                )
+                docs_manager.remember_entity(
+                    category=category, name=entity.name, docs=entity.new_docs
+                )
             progress()
 
-        init_path = code_manager.resolve_package_path(category, "__init__.py")
-        init = code_manager.read_code(init_path)
-        new_init = code_manager.apply_init(init, names=names)
-        if diff:
-            _diff_in_progress(code_path, init, new_init, progress)
+        init_path, init, new_init = code_manager.process_init(category=category, names=names)
+        if writer is None:
+            patch.write(init_path, init, new_init)
         else:
-            init_path.write_text(new_init)
+            writer.write(init_path, new_init)
+            code_manager.remember_init(category=category, names=names, code=new_init)
 
         docs_index_path, old_index_docs, new_index_docs = docs_manager.process_index(
             category=category
         )
-        if diff:
-            _diff_in_progress(docs_index_path, old_index_docs, new_index_docs, progress)
+        if writer is None:
+            patch.write(docs_index_path, old_index_docs, new_index_docs)
         else:
-            docs_index_path.write_text(new_index_docs)
+            writer.write(docs_index_path, new_index_docs)
         progress()
 
+    for stats in pipeline.stats:
+        logger.info("Stage %s of %s", stats, category)
+    code_manager.format_cache.trim()
+
 
 @group_apply.command("bot")
 @click.option(
     "--diff",
     is_flag=True,
     default=False,
-    help="Show diff instead of applying changes",
+    help="Write combined patch to stdout instead of applying changes",
+)
+@click.option(
+    "--patch-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write combined patch to the file instead of applying changes",
 )
 @pass_config
 @pass_registry
-def command_apply_bot(registry: EntitiesRegistry, config: ProjectConfig, diff: bool):
+def command_apply_bot(
+    registry: EntitiesRegistry, config: ProjectConfig, diff: bool, patch_out: Path | None
+):
     """
     Generate Bot class
     """
-    _apply_bot(registry=registry, config=config, diff=diff)
+    registry.initialize()
+    with _output(config=config, diff=diff, patch_out=patch_out) as (manifest, writer, patch, _):
+        _apply_bot(registry=registry, config=config, manifest=manifest, writer=writer, patch=patch)
 
 
-def _apply_bot(registry: EntitiesRegistry, config: ProjectConfig, diff: bool):
+def _apply_bot(
+    registry: EntitiesRegistry,
+    config: ProjectConfig,
+    manifest: Manifest,
+    writer: FileWriter | None,
+    patch: PatchWriter | None,
+):
     """
     Generate Bot class
     """
     with alive_bar(
         title="Rendering bot class",
         enrich_print=False,
+        file=sys.stderr,
         title_length=20,
         monitor=False,
     ) as progress:
-        code_manager = CodegenManager(config=config, registry=registry)
+        code_manager = CodegenManager(config=config, registry=registry, manifest=manifest)
         progress()
         code_path, old_code, new_code = code_manager.process_bot()
         progress()
-        if diff:
-            _diff_in_progress(code_path, old_code, new_code, progress)
+        if writer is None:
+            patch.write(code_path, old_code, new_code)
         else:
-            code_path.write_text(new_code)
+            writer.write(code_path, new_code)
+            code_manager.remember_bot(code=new_code)
+        code_manager.format_cache.trim()
         progress()
-
-
-def _render_diff(path: Path, a: str, b: str):
-    diff_lines = difflib.unified_diff(
-        a=a.splitlines(keepends=True),
-        b=b.splitlines(keepends=True),
-        fromfile=str(path),
-        tofile=str(path),
-    )
-    diff = "".join(diff_lines)
-    return diff
-
-
-def _diff_in_progress(path: Path, a: str, b: str, bar):
-    diff = _render_diff(path, a, b)
-    if not diff:
-        return
-    with bar.pause():
-        click.echo_via_pager(diff)
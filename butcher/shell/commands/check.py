@@ -0,0 +1,88 @@
+import typing as t
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+import click
+from click import Context, pass_context
+
+from butcher.cache import Manifest
+from butcher.codegen.manager import CodegenManager
+from butcher.docs.manager import DocsManager
+from butcher.parsers.entities.generator import EntitiesRegistry
+from butcher.pipeline import ApplyPipeline
+from butcher.shell.config import ProjectConfig, pass_config
+
+
+def _iter_results(
+    registry: EntitiesRegistry,
+    code_manager: CodegenManager,
+    docs_manager: DocsManager,
+    executor: Executor | None,
+) -> t.Iterator[tuple[Path, str, str]]:
+    for category in ("types", "methods", "enums"):
+        names = tuple(registry.registry[category].keys())
+        pipeline = ApplyPipeline(
+            code_manager=code_manager,
+            docs_manager=docs_manager,
+            category=category,
+            executor=executor,
+        )
+        for entity in pipeline.run(names):
+            yield entity.code_path, entity.old_code, entity.new_code
+            yield entity.docs_path, entity.old_docs, entity.new_docs
+        yield code_manager.process_init(category=category, names=names)
+        yield docs_manager.process_index(category=category)
+    yield code_manager.process_bot()
+
+
+@click.command("check", help="Check that the generated code and docs are up to date")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of formatting worker processes, 1 formats in-process, 0 means all CPUs",
+)
+@pass_config
+@pass_context
+def command_check(ctx: Context, config: ProjectConfig, jobs: int):
+    """
+    Files with the fingerprints recorded by the last apply are not rendered,
+    the others are rendered and compared with their current content.
+
+    Fingerprints are kept in the local cache of the project dir,
+    so without the cache of the previous run (e.g. in a fresh CI checkout)
+    every file is rendered and formatted by the pool of the worker processes
+    """
+    registry = EntitiesRegistry(
+        project_dir=config.project_dir, resolve_workers=config.resolve_jobs
+    )
+    registry.initialize()
+    manifest = Manifest.from_project(config.project_dir)
+    code_manager = CodegenManager(config=config, registry=registry, manifest=manifest)
+    docs_manager = DocsManager(config=config, registry=registry, manifest=manifest)
+
+    with ExitStack() as stack:
+        executor = None
+        if jobs != 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs or None))
+            # Workers are forked before the reader threads of the pipeline are started
+            executor.submit(int).result()
+        stale = [
+            path
+            for path, content, new_content in _iter_results(
+                registry, code_manager, docs_manager, executor
+            )
+            if content != new_content
+        ]
+    code_manager.format_cache.trim()
+    if not stale:
+        click.echo("Generated files are up to date")
+        return
+
+    for path in stale:
+        click.echo(path)
+    click.echo(f"{len(stale)} stale files, run `butcher apply all` to update them", err=True)
+    ctx.exit(1)
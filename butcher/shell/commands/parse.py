@@ -1,13 +1,65 @@
+from pathlib import Path
+
 import click
 
+from butcher.cache import resolve_cache_path
 from butcher.data import dump_json
-from butcher.parsers.api_parser import parse_docs
+from butcher.parsers.api_parser import load_page, parse_page
+from butcher.parsers.cache import PageCache
 from butcher.parsers.consts import DOCS_URL
 from butcher.shell.config import ProjectConfig, pass_config
 
 
 @click.command("parse", help="Parse API docs to cache")
+@click.option(
+    "--url",
+    default=DOCS_URL,
+    show_default=True,
+    help="URL of the API docs page",
+)
+@click.option(
+    "--from-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Parse local HTML snapshot of the API docs instead of loading the page",
+)
+@click.option(
+    "--save-snapshot",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Save exact HTML of the parsed page to the file",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Parse the page even when it is not modified since the last run",
+)
 @pass_config
-def command_parse(config: ProjectConfig):
-    docs = parse_docs(DOCS_URL)
-    dump_json(value=docs, path=config.project_dir / "schema" / "schema.json")
+def command_parse(
+    config: ProjectConfig,
+    url: str,
+    from_file: Path | None,
+    save_snapshot: Path | None,
+    force: bool,
+):
+    schema_path = config.project_dir / "schema" / "schema.json"
+
+    if from_file:
+        # URL is still used as the base for the relative links
+        raw_content, modified = from_file.read_text(encoding="utf-8"), True
+    else:
+        cache = PageCache(resolve_cache_path(config.project_dir, "http"))
+        raw_content, modified = load_page(url=url, cache=cache)
+
+    if save_snapshot:
+        save_snapshot.parent.mkdir(parents=True, exist_ok=True)
+        save_snapshot.write_text(raw_content, encoding="utf-8")
+        click.echo(f"Snapshot of the page saved to {save_snapshot}")
+
+    if not modified and not force and schema_path.exists():
+        click.echo("API docs are not modified since the last run")
+        return
+
+    docs = parse_page(raw_content=raw_content, url=url)
+    dump_json(value=docs, path=schema_path)
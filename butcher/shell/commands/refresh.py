@@ -3,84 +3,122 @@ from collections import defaultdict
 from pathlib import Path
 
 import click
+import orjson
 
-from butcher.data import dump_json, load_json
+from butcher.cache import SchemaIndex, fingerprint
+from butcher.data import dumps_json, load_json
 from butcher.parsers.entities.entity_type import ENTITY_CATEGORY, detect_entity_type_by_name
 from butcher.shell.config import ProjectConfig, pass_config
+from butcher.writer import FileWriter
 
 logger = logging.getLogger(__name__)
 
 
+def _refresh_entity(entity_data_path: Path, value: dict, writer: FileWriter) -> bool:
+    """
+    Update the entity file keeping its meta, the file is read once
+    and is written only when its content is changed
+    """
+    content = entity_data_path.read_bytes()
+    entity_data = orjson.loads(content)
+    entity_data["meta"].update(value["meta"])
+    new_content = dumps_json(
+        {
+            "meta": entity_data["meta"],
+            "group": value["group"],
+            "object": value["object"],
+        }
+    )
+    if new_content == content:
+        return False
+    writer.write(entity_data_path, new_content, compare=False)
+    return True
+
+
 @click.command("refresh", help="Update entities from docs")
 @pass_config
 def command_refresh(config: ProjectConfig):
     click.echo("Refreshing entities tree...")
 
     docs = load_json(path=config.project_dir / "schema" / "schema.json")
+    index = SchemaIndex.from_project(config.project_dir)
     known_entities = defaultdict(set)
+    # Index is updated when the files are written, it keeps their modification time
+    index_updates: list[tuple[str, str | None, Path, bool]] = []
 
     skipped = 0
     added = 0
     updated = 0
     deprecated = 0
 
-    for group in docs["items"]:
-        for entity in group["children"]:
-            entity_category = detect_entity_type_by_name(entity["name"])
-            known_entities[entity_category].add(entity["name"])
-
-            entity_dir: Path = (
-                config.project_dir / ENTITY_CATEGORY[entity_category] / entity["name"]
-            )
-            entity_dir.mkdir(parents=True, exist_ok=True)
-            entity_data_path = entity_dir / "entity.json"
-
-            meta = {"deprecated": False}
+    with FileWriter() as writer:
+        for group in docs["items"]:
             group_info = {
                 "title": group["title"],
                 "anchor": group["anchor"],
             }
+            for entity in group["children"]:
+                entity_category = ENTITY_CATEGORY[detect_entity_type_by_name(entity["name"])]
+                known_entities[entity_category].add(entity["name"])
 
-            if entity_data_path.exists():
-                logger.info("Refreshed entity in %s", entity_dir)
-                entity_data = load_json(path=entity_data_path)
-                entity_data["object"] = entity
-                entity_data["group"] = group_info
-                entity_data["meta"].update(meta)
-                if dump_json(
-                    value={
-                        "meta": entity_data["meta"],
-                        "group": entity_data["group"],
-                        "object": entity_data["object"],
-                    },
-                    path=entity_data_path,
-                ):
-                    updated += 1
-                else:
+                entity_dir: Path = config.project_dir / entity_category / entity["name"]
+                entity_data_path = entity_dir / "entity.json"
+                key = f"{entity_category}/{entity['name']}"
+                content_hash = fingerprint(group_info, entity)
+                # Entity is not changed in the schema and its file is not changed since it was written
+                if index.check(key, content_hash, entity_data_path):
                     skipped += 1
-            else:
-                logger.info("Created entity in %s", entity_dir)
-                dump_json(
-                    value={
-                        "meta": meta,
-                        "group": group_info,
-                        "object": entity,
-                    },
-                    path=entity_data_path,
-                )
-                added += 1
-
-    for entity_type, entity_names in known_entities.items():
-        entities_dir = config.project_dir / ENTITY_CATEGORY[entity_type]
-        for entity_data_path in entities_dir.glob("**/entity.json"):
-            if entity_data_path.parent.name not in entity_names:
-                entity_data = load_json(path=entity_data_path)
-                if entity_data["meta"].get("deprecated"):
                     continue
+
+                value = {
+                    "meta": {"deprecated": False},
+                    "group": group_info,
+                    "object": entity,
+                }
+                if entity_data_path.exists():
+                    logger.info("Refreshed entity in %s", entity_dir)
+                    if _refresh_entity(entity_data_path, value, writer):
+                        updated += 1
+                    else:
+                        skipped += 1
+                else:
+                    logger.info("Created entity in %s", entity_dir)
+                    writer.write(entity_data_path, dumps_json(value), compare=False)
+                    added += 1
+                index_updates.append((key, content_hash, entity_data_path, False))
+
+        if index.loaded:
+            indexed_entities = [key.split("/", maxsplit=1) for key in list(index.entries)]
+        else:
+            # Entities created before the index are found in the entities tree
+            indexed_entities = [
+                (entity_category, entity_data_path.parent.name)
+                for entity_category in known_entities
+                for entity_data_path in (config.project_dir / entity_category).glob(
+                    "**/entity.json"
+                )
+            ]
+        for entity_category, entity_name in indexed_entities:
+            if entity_name in known_entities[entity_category]:
+                continue
+            key = f"{entity_category}/{entity_name}"
+            entity_data_path = config.project_dir / entity_category / entity_name / "entity.json"
+            if index.check(key, None, entity_data_path, deprecated=True):
+                continue
+            if not entity_data_path.exists():
+                index.remove(key)
+                continue
+            entity_data = load_json(path=entity_data_path)
+            if not entity_data["meta"].get("deprecated"):
                 deprecated += 1
                 logger.warning("Entity marked as deprecated in %s", entity_data_path.parent)
                 entity_data["meta"]["deprecated"] = True
-                dump_json(path=entity_data_path, value=entity_data)
+                writer.write(entity_data_path, dumps_json(entity_data), compare=False)
+            index_updates.append((key, None, entity_data_path, True))
+
+    for key, content_hash, entity_data_path, is_deprecated in index_updates:
+        index.update(key, content_hash, entity_data_path, deprecated=is_deprecated)
+    index.save()
 
     if added:
         logger.info("Added new %d entities", added)
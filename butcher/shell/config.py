@@ -9,6 +9,7 @@ class ProjectConfig:
     project_dir: Path
     package_dir: Path
     docs_dir: Path
+    resolve_jobs: int = 1
 
 
 pass_config = click.make_pass_decorator(ProjectConfig)
@@ -6,6 +6,7 @@ import click
 from click import Context
 
 from butcher.shell.commands.apply import group_apply
+from butcher.shell.commands.check import command_check
 from butcher.shell.commands.parse import command_parse
 from butcher.shell.commands.refresh import command_refresh
 from butcher.shell.config import ProjectConfig
@@ -35,17 +36,25 @@ logger = logging.getLogger(__name__)
     show_default=True,
     help="Path to docs dir",
 )
+@click.option(
+    "--resolve-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of threads running independent entity resolvers",
+)
 @click.pass_context
-def cli(ctx: Context, project_dir: Path, package_dir: Path, docs_dir: Path):
+def cli(ctx: Context, project_dir: Path, package_dir: Path, docs_dir: Path, resolve_jobs: int):
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)8s: %(message)s",
-        stream=sys.stdout,
+        stream=sys.stderr,
     )
     ctx.obj = ProjectConfig(
         project_dir=project_dir,
         package_dir=package_dir,
         docs_dir=docs_dir,
+        resolve_jobs=resolve_jobs,
     )
 
 
@@ -54,6 +63,7 @@ def main():
         command_parse,
         command_refresh,
         group_apply,
+        command_check,
     ]:
         cli.add_command(command)
     cli(auto_envvar_prefix="PARSER")
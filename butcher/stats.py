@@ -0,0 +1,52 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StageStats:
+    """
+    Busy time and processed items of the pipeline stage,
+    depth is the number of items waiting for the stage or processed by it
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.busy = 0.0
+        self.items = 0
+        self.depth = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        summary = f"{self.name}: {self.items} items, busy {self.busy:.3f}s"
+        if self.max_depth:
+            summary += f", max queue depth {self.max_depth}"
+        return summary
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(time.perf_counter() - started_at)
+
+    def add(self, elapsed: float) -> None:
+        with self._lock:
+            self.busy += elapsed
+            self.items += 1
+
+    def enqueue(self) -> None:
+        with self._lock:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+
+    def dequeue(self) -> None:
+        with self._lock:
+            self.depth -= 1
+
+    def observe(self, depth: int) -> None:
+        with self._lock:
+            self.depth = depth
+            self.max_depth = max(self.max_depth, depth)
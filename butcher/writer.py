@@ -0,0 +1,132 @@
+import logging
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+
+from butcher.stats import StageStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+class FileWriter:
+    """
+    Write-behind writer of the generated files.
+
+    Files are written by the pool of threads to the temporary files next to them
+    and are moved to their places all together on commit,
+    so an interrupted run does not leave a half-written tree.
+    Files with unchanged content are not written at all, so their modification time is kept.
+
+    Used as a context manager, the files are committed on exit
+    or the temporary files are removed when the block is interrupted
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="writer")
+        self.pending: list[Future[tuple[Path, str] | None]] = []
+        self.stats = StageStats("write")
+        umask = os.umask(0)
+        os.umask(umask)
+        self.default_mode = 0o666 & ~umask
+
+    def __enter__(self) -> "FileWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def write(self, path: Path, content: str | bytes, compare: bool = True) -> None:
+        """
+        Schedule the write of the file,
+        comparison with the current content can be skipped when the caller already did it
+        """
+        if isinstance(content, str):
+            content = content.encode()
+        self.stats.enqueue()
+        self.pending.append(self.executor.submit(self._write_temp, path, content, compare))
+
+    def _write_temp(self, path: Path, content: bytes, compare: bool) -> tuple[Path, str] | None:
+        try:
+            with self.stats.measure():
+                return self._write_temp_file(path, content, compare)
+        finally:
+            self.stats.dequeue()
+
+    def _write_temp_file(
+        self, path: Path, content: bytes, compare: bool
+    ) -> tuple[Path, str] | None:
+        try:
+            if compare and path.read_bytes() == content:
+                return None
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = self.default_mode
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.chmod(temp_path, mode)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return path, temp_path
+
+    def _wait(self) -> list[tuple[Path, str]]:
+        written = []
+        error = None
+        for future in self.pending:
+            try:
+                result = future.result()
+            except BaseException as e:
+                error = error or e
+                continue
+            if result is not None:
+                written.append(result)
+        self.pending = []
+        if error is not None:
+            for _, temp_path in written:
+                os.unlink(temp_path)
+            raise error
+        return written
+
+    def commit(self) -> int:
+        """
+        Wait for the scheduled writes and move the written files to their places
+        """
+        scheduled = len(self.pending)
+        try:
+            written = self._wait()
+            for path, temp_path in written:
+                os.replace(temp_path, path)
+        finally:
+            self.executor.shutdown()
+        logger.debug("Written %d files, %d unchanged", len(written), scheduled - len(written))
+        return len(written)
+
+    def rollback(self) -> None:
+        """
+        Drop the scheduled writes and remove the temporary files
+        """
+        for future in self.pending:
+            future.cancel()
+        self.executor.shutdown()
+        for future in self.pending:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            if (result := future.result()) is not None:
+                os.unlink(result[1])
+        self.pending = []